@@ -1,11 +1,130 @@
-import base64
+import html
+import logging
 import os
-from pathlib import Path
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-import google.generativeai as genai
-import pandas as pd
 import streamlit as st
 
+import llm
+import metrics
+import startup_timing
+import static_assets
+from coach import (
+    COACH_SYSTEM_INSTRUCTION,
+    DEFAULT_MODEL_NAME,
+    STRATEGY_ANGLES,
+    CoachState,
+    StrategyStreamParser,
+    build_angle_prompt,
+    build_coach_prompt,
+    build_situation_message,
+    cache_model_key,
+    estimate_tokens,
+    format_strategies,
+    parse_strategies,
+    trim_history,
+)
+from fanout import fan_out
+from hall_of_fame import HallOfFame, read_records
+from jobs import JobCancelled, JobRunner
+from ratelimit import RateLimitBusy, SingleFlight, TokenBucket
+from response_cache import ResponseCache
+from strategy_store import StrategyStore
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = DEFAULT_MODEL_NAME
+# 나의 큰틀전략 목록 / 명예의 전당에서 한 페이지에 보여줄 개수
+STRATEGY_PAGE_SIZE = int(os.getenv("STRATEGY_PAGE_SIZE", "20"))
+HALL_OF_FAME_PAGE_SIZE = int(os.getenv("HALL_OF_FAME_PAGE_SIZE", "10"))
+# "gemini": 실제 API, "fake": 부하 테스트용 로컬 가짜 백엔드 (FAKE_LLM_* 로 조절)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+CACHE_MODEL_KEY = cache_model_key(LLM_BACKEND, MODEL_NAME)
+# "stream": 전략이 완성되는 대로 표시, "blocking": 전체 응답을 기다린 뒤 표시,
+# "fanout": 관점별로 요청을 나눠 동시에 보내고 끝나는 대로 표시,
+# "chat": 스트리밍 + 결과에 이어서 질문할 수 있는 여러 턴 코칭
+AI_COACH_MODE = os.getenv("AI_COACH_MODE", "stream")
+# chat 모드에서 다음 턴에 함께 보낼 대화 기록의 최대 토큰 수 (글자 수로 어림)
+AI_CHAT_TOKEN_BUDGET = int(os.getenv("AI_CHAT_TOKEN_BUDGET", "2000"))
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "30"))
+# 설정하면 이 시간(초) 안에 끝나지 않은 관점별 요청을 한 번 더 보냅니다.
+AI_HEDGE_AFTER = (
+    float(os.getenv("AI_HEDGE_AFTER")) if os.getenv("AI_HEDGE_AFTER") else None
+)
+# Gemini 호출 속도 제한: 초당 요청 수, 순간 허용량, 대기열 길이, 최대 대기 시간(초)
+GEMINI_RPS = float(os.getenv("GEMINI_RPS", "1"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+GEMINI_MAX_WAITERS = int(os.getenv("GEMINI_MAX_WAITERS", "32"))
+AI_RATE_WAIT = float(os.getenv("AI_RATE_WAIT", "10"))
+# 로컬 추천: "background"는 비슷한 전략을 바로 보여주고 AI도 함께 호출,
+# "fallback"은 비슷한 전략이 없을 때만 AI 호출, "off"는 로컬 추천을 쓰지 않음
+LOCAL_RECOMMEND_MODE = os.getenv("LOCAL_RECOMMEND_MODE", "background")
+LOCAL_RECOMMEND_MIN_SCORE = float(os.getenv("LOCAL_RECOMMEND_MIN_SCORE", "0.05"))
+# 백그라운드 작업 하나가 쓸 수 있는 최대 시간(초)과 화면 갱신 주기(초)
+AI_JOB_DEADLINE = float(os.getenv("AI_JOB_DEADLINE", "60"))
+# 동시에 실행할 수 있는 백그라운드 작업 수. fanout 모드는 작업마다 관점 수만큼
+# 요청을 동시에 보내므로 관점별 요청 풀(AI_WORKERS)의 기본 크기도 이에 맞춥니다.
+AI_JOB_WORKERS = int(os.getenv("AI_JOB_WORKERS", "16"))
+AI_WORKERS = int(os.getenv("AI_WORKERS", str(len(STRATEGY_ANGLES) * AI_JOB_WORKERS)))
+AI_POLL_INTERVAL = float(os.getenv("AI_POLL_INTERVAL", "0.5"))
+
+# --- 계측 지표 ---
+RERUN_SECONDS = metrics.REGISTRY.histogram(
+    "strategymaker_rerun_seconds", "Full script rerun duration by menu."
+)
+LLM_SECONDS = metrics.REGISTRY.histogram(
+    "strategymaker_llm_request_seconds", "LLM request duration by coach mode."
+)
+LLM_RESPONSE_CHARS = metrics.REGISTRY.histogram(
+    "strategymaker_llm_response_chars",
+    "LLM response size in characters.",
+    buckets=metrics.SIZE_BUCKETS,
+)
+LLM_PROMPT_TOKENS = metrics.REGISTRY.histogram(
+    "strategymaker_llm_prompt_tokens",
+    "Estimated prompt tokens sent per LLM request.",
+    buckets=metrics.SIZE_BUCKETS,
+)
+LLM_ERRORS = metrics.REGISTRY.counter(
+    "strategymaker_llm_errors_total", "Failed LLM requests by coach mode."
+)
+
+# 설정하면 이 시간(ms)보다 오래 걸린 재실행의 프로파일을 PROFILE_DIR에 남깁니다.
+PROFILE_SLOW_MS = os.getenv("PROFILE_SLOW_MS")
+rerun_started = time.perf_counter()
+
+
+@contextmanager
+def profiled(label):
+    """PROFILE_SLOW_MS가 설정되어 있으면 감싼 구간을 프로파일링합니다.
+
+    전체 재실행과 fragment 단독 재실행 모두에 씁니다. st.rerun()/st.stop()으로
+    중간에 끝나도 프로파일러는 반드시 멈춥니다.
+    """
+    profiler = None
+    if PROFILE_SLOW_MS:
+        profiler = metrics.RerunProfiler(
+            os.getenv("PROFILE_DIR", ".profiles"),
+            float(PROFILE_SLOW_MS),
+            engine=os.getenv("PROFILER", "cprofile"),
+        )
+        try:
+            profiler.start()
+        except ValueError:
+            # 바깥 재실행이나 다른 세션이 이미 프로파일링 중이면 건너뜁니다.
+            profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profile_path = profiler.stop(label)
+            if profile_path:
+                logger.warning("느린 재실행 프로파일을 저장했습니다: %s", profile_path)
+
+
 # --- 페이지 기본 설정 ---
 st.set_page_config(
     page_title="큰틀전략 메이커",
@@ -15,197 +134,674 @@ st.set_page_config(
 )
 
 
-# --- 이미지 파일을 Base64로 인코딩하는 함수 ---
-def img_to_base_64(image_path):
-    """로컬 이미지 파일을 Base64 문자열로 변환합니다."""
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except FileNotFoundError:
-        return None
+# --- 정적 자산 (아이콘/스타일시트/폰트) ---
+@st.cache_resource
+def get_static_assets():
+    """빌드된 자산 목록과 압축된 스타일시트를 프로세스에서 한 번만 읽습니다.
+
+    아이콘과 폰트는 Streamlit 정적 파일 서빙(app/static)으로 내려보내고,
+    재실행마다 보내는 것은 작은 스타일시트와 이미지 URL뿐입니다.
+    """
+    with startup_timing.timed("static_assets"):
+        manifest = static_assets.load_manifest()
+        stylesheet = static_assets.STATIC_DIR / manifest["stylesheet"]
+        return manifest, stylesheet.read_text(encoding="utf-8")
 
 
 # --- UI 스타일 적용 함수 ---
 def apply_ui_styles():
-    """앱 전체에 적용될 CSS 스타일을 정의합니다."""
+    """앱 전체에 적용될 CSS 스타일을 적용합니다. 원본은 assets/styles.css입니다."""
+    _, css = get_static_assets()
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+# --- AI 응답 캐시 (디스크 공유, 재시작 후에도 유지) ---
+@st.cache_resource
+def get_response_cache():
+    """프로세스 전체에서 공유하는 응답 캐시를 한 번만 생성합니다."""
+    return ResponseCache(
+        os.getenv("RESPONSE_CACHE_PATH", ".cache/response_cache.sqlite3"),
+        ttl_seconds=int(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000")),
+    )
+
+
+# --- 나의 큰틀전략 저장소 ---
+@st.cache_resource
+def get_strategy_store():
+    """모든 세션이 함께 쓰는 큰틀전략 저장소입니다."""
+    return StrategyStore(os.getenv("STRATEGY_DB_PATH", ".data/strategies.sqlite3"))
+
+
+def get_owner_id():
+    """재접속해도 같은 전략 목록을 볼 수 있도록 URL의 사용자 키를 쓰거나 새로 만듭니다."""
+    owner_id = st.query_params.get("uid")
+    if not owner_id:
+        owner_id = uuid.uuid4().hex
+        st.query_params["uid"] = owner_id
+    return owner_id
+
+
+def delete_my_strategy(owner_id, strategy_id):
+    if get_strategy_store().delete(owner_id, strategy_id):
+        update_recommender(lambda index: index.remove(("my", strategy_id)))
+
+
+@st.fragment
+@metrics.span("fragment", fragment="my_strategy_list")
+@profiled("fragment-my_strategy_list")
+def my_strategy_list():
+    """나의 큰틀전략 목록을 한 페이지씩 그립니다.
+
+    삭제/페이지 이동은 콜백으로 처리되어 이 목록만 다시 그리고, 헤더와 메뉴는
+    건드리지 않습니다. 페이지는 각 페이지의 시작 id(커서)를 쌓아 두며 이동합니다.
+    """
+    store = get_strategy_store()
+    owner_id = st.session_state.owner_id
+    cursors = st.session_state.setdefault("my_strategy_cursors", [None])
+    rows = store.page(owner_id, limit=STRATEGY_PAGE_SIZE + 1, before_id=cursors[-1])
+    if not rows and len(cursors) > 1:
+        # 마지막 항목을 지워 빈 페이지가 되면 이전 페이지로 돌아갑니다.
+        cursors.pop()
+        rows = store.page(owner_id, limit=STRATEGY_PAGE_SIZE + 1, before_id=cursors[-1])
+    if not rows:
+        return
+    has_next = len(rows) > STRATEGY_PAGE_SIZE
+    rows = rows[:STRATEGY_PAGE_SIZE]
+
+    st.markdown('<div class="list-container">', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="list-header"><p class="label">큰틀전략</p><p class="title">나의 큰틀전략 목록</p></div>',
+        unsafe_allow_html=True,
+    )
+    for row in rows:
+        st.markdown('<div class="strategy-item">', unsafe_allow_html=True)
+        col1, col2 = st.columns([0.8, 0.2])
+        with col1:
+            st.caption(f"작성자: {row['name']}")
+            st.write(f"**{row['strategy']}**")
+        with col2:
+            st.button(
+                "삭제",
+                key=f"delete_{row['id']}",
+                use_container_width=True,
+                on_click=delete_my_strategy,
+                args=(owner_id, row["id"]),
+            )
+        st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if has_next or len(cursors) > 1:
+        prev_col, page_col, next_col = st.columns([0.3, 0.4, 0.3])
+        with prev_col:
+            if len(cursors) > 1:
+                st.button(
+                    "이전",
+                    key="my_strategy_prev",
+                    use_container_width=True,
+                    on_click=cursors.pop,
+                )
+        with page_col:
+            total_pages = -(-store.count(owner_id) // STRATEGY_PAGE_SIZE)
+            st.caption(f"{len(cursors)} / {total_pages} 페이지")
+        with next_col:
+            if has_next:
+                st.button(
+                    "다음",
+                    key="my_strategy_next",
+                    use_container_width=True,
+                    on_click=cursors.append,
+                    args=(rows[-1]["id"],),
+                )
+
+
+@contextmanager
+def observe_llm_call(mode, prompt):
+    """LLM 호출 하나의 보낸 토큰 수(어림), 소요 시간, 응답 크기, 실패 여부를 기록합니다."""
+    LLM_PROMPT_TOKENS.observe(estimate_tokens(prompt), mode=mode)
+    call = {"chars": 0}
+    start = time.perf_counter()
+    try:
+        yield call
+    except JobCancelled:
+        # 사용자가 취소했거나 마감을 넘긴 것이라 호출 실패로 세지 않습니다.
+        raise
+    except Exception:
+        LLM_ERRORS.inc(mode=mode)
+        raise
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - start, mode=mode)
+        LLM_RESPONSE_CHARS.observe(call["chars"], mode=mode)
+
+
+def stream_strategies(backend, prompt, limiter):
+    """스트리밍 응답에서 전략 블록이 완성될 때마다 하나씩 내보냅니다."""
+    parser = StrategyStreamParser()
+    limiter.acquire(AI_RATE_WAIT)
+    with observe_llm_call("stream", prompt) as call:
+        for text in backend.stream(prompt, timeout=AI_REQUEST_TIMEOUT):
+            call["chars"] += len(text)
+            yield from parser.feed(text)
+    yield from parser.close()
+
+
+def stream_chat(backend, history, message, limiter, check=None):
+    """지시문은 system instruction으로, 이전 대화는 기록으로 두고 새 메시지만 보냅니다.
+
+    check가 주어지면 토큰을 기다리기 전과 응답 조각마다 불러 취소/마감을 확인합니다.
+    다른 세션과 공유하는 호출에는 넘기지 않습니다.
+    """
+    parser = StrategyStreamParser()
+    if check:
+        check()
+    limiter.acquire(AI_RATE_WAIT)
+    sent = COACH_SYSTEM_INSTRUCTION + "".join(text for _, text in history) + message
+    with observe_llm_call("chat", sent) as call:
+        for text in backend.chat_stream(
+            COACH_SYSTEM_INSTRUCTION, history, message, timeout=AI_REQUEST_TIMEOUT
+        ):
+            if check:
+                check()
+            call["chars"] += len(text)
+            yield from parser.feed(text)
+    yield from parser.close()
+
+
+def continue_coach_chat(
+    history, message, backend, limiter, on_strategy=None, check=None
+):
+    """chat 모드의 후속 질문 하나에 답합니다. 대화마다 달라서 캐시하지 않습니다."""
+    result = []
+    for item in stream_chat(backend, history, message, limiter, check=check):
+        result.append(item)
+        if on_strategy:
+            on_strategy(result)
+    return result
+
+
+@st.cache_resource
+def get_ai_executor():
+    """관점별 동시 요청에 쓰는 프로세스 공용 스레드 풀입니다."""
+    return ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="ai")
+
+
+@st.cache_resource
+def get_llm_backend():
+    """설정된 LLM 클라이언트/모델을 프로세스에서 한 번만 만들어 재사용합니다."""
+    with startup_timing.timed(f"llm_backend:{LLM_BACKEND}"):
+        return llm.make_backend(LLM_BACKEND, MODEL_NAME)
+
+
+@st.cache_resource
+def get_rate_limiter():
+    """모든 세션이 함께 쓰는 Gemini 호출 속도 제한기입니다."""
+    return TokenBucket(GEMINI_RPS, GEMINI_BURST, max_waiters=GEMINI_MAX_WAITERS)
+
+
+@st.cache_resource
+def get_single_flight():
+    """같은 프롬프트로 동시에 들어온 요청을 하나의 호출로 합칩니다."""
+    return SingleFlight()
+
+
+@st.cache_resource
+def get_job_runner():
+    """세션별 AI 생성 작업을 실행하는 프로세스 공용 작업 실행기입니다."""
+    return JobRunner(max_workers=AI_JOB_WORKERS)
+
+
+def fan_out_strategies(backend, user_prompt, executor, limiter):
+    """관점별 요청을 동시에 보내고 끝나는 순서대로 전략을 내보냅니다."""
+
+    def call(angle):
+        prompt = build_angle_prompt(user_prompt, angle)
+        with observe_llm_call("fanout", prompt) as llm_call:
+            text_out = backend.generate(prompt, timeout=AI_REQUEST_TIMEOUT)
+            llm_call["chars"] = len(text_out)
+        strategies = parse_strategies(text_out)
+        if not strategies:
+            raise ValueError("응답 형식을 해석할 수 없습니다.")
+        return strategies[0]
+
+    calls = {
+        key: (lambda angle=angle: call(angle)) for key, angle in STRATEGY_ANGLES.items()
+    }
+    failures = []
+    # 토큰은 풀에 넣기 전에 받습니다. 풀 스레드에서 기다리면 그 시간이 timeout을
+    # 잡아먹어, 붐빌 때 보내지도 못한 요청이 시간 초과로 보고됩니다.
+    for key, item, error in fan_out(
+        executor,
+        calls,
+        AI_REQUEST_TIMEOUT,
+        hedge_after=AI_HEDGE_AFTER,
+        before_submit=lambda: limiter.acquire(AI_RATE_WAIT),
+    ):
+        if error is None:
+            yield item
+        else:
+            logger.warning("관점 '%s' 전략 생성 실패: %s", key, error)
+            failures.append(error)
+    if len(failures) == len(calls):
+        raise failures[0]
+
+
+def generate_ai_strategies(
+    user_prompt,
+    backend,
+    cache,
+    executor,
+    limiter,
+    flights,
+    on_strategy=None,
+    check=None,
+):
+    """캐시를 먼저 확인하고, 없으면 설정된 모드로 전략을 생성합니다.
+
+    백그라운드 스레드에서도 실행되므로 Streamlit API를 호출하지 않습니다.
+    같은 프롬프트가 이미 생성 중이면 새로 호출하지 않고 그 결과를 함께 받습니다.
+    on_strategy는 전략이 하나 완성될 때마다 지금까지의 목록과 함께 호출됩니다.
+    check는 공유 호출에 들어가기 전과 다른 세션의 호출을 기다리는 동안 불려
+    취소/마감된 작업이 더 기다리지 않게 합니다. 공유 호출 자체는 멈추지 않습니다.
+    """
+    prompt = build_coach_prompt(user_prompt)
+    strategies = cache.get(CACHE_MODEL_KEY, prompt)
+    if strategies is None:
+
+        def call_model():
+            if AI_COACH_MODE == "blocking":
+                limiter.acquire(AI_RATE_WAIT)
+                with observe_llm_call("blocking", prompt) as llm_call:
+                    text_out = backend.generate(prompt, timeout=AI_REQUEST_TIMEOUT)
+                    llm_call["chars"] = len(text_out)
+                result = parse_strategies(text_out)
+            else:
+                if AI_COACH_MODE == "fanout":
+                    items = fan_out_strategies(backend, user_prompt, executor, limiter)
+                elif AI_COACH_MODE == "chat":
+                    # 첫 턴도 대화로 보내야 후속 질문이 같은 지시문을 이어 씁니다.
+                    items = stream_chat(
+                        backend, (), build_situation_message(user_prompt), limiter
+                    )
+                else:
+                    items = stream_strategies(backend, prompt, limiter)
+                result = []
+                for item in items:
+                    result.append(item)
+                    # 다른 세션도 이 호출을 기다릴 수 있어 on_strategy는 취소돼도 예외를 던지지 않습니다.
+                    if on_strategy:
+                        on_strategy(result)
+            if result:
+                cache.set(CACHE_MODEL_KEY, prompt, result, label=user_prompt)
+            return result
+
+        if check:
+            check()
+        strategies, shared = flights.do(
+            cache.make_key(CACHE_MODEL_KEY, prompt),
+            call_model,
+            timeout=AI_JOB_DEADLINE,
+            check=check,
+        )
+        if shared:
+            logger.info("동일한 요청의 진행 중 결과를 공유했습니다.")
+    logger.info("AI 응답 캐시 통계: %s", cache.stats())
+    return strategies
+
+
+def render_ai_strategies(strategies):
+    """AI 코치 전략 카드 목록을 그립니다."""
+    st.markdown('<div class="list-container">', unsafe_allow_html=True)
     st.markdown(
-        """
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap');
-            
-            :root {
-                --primary-color: #2BA7D1;
-                --primary-color-hover: #2596BC;
-                --black-color: #0D1628;
-                --secondary-color: #86929A;
-                --divider-color: #F1F1F1;
-                --icon-bg-color: rgba(12, 124, 162, 0.04);
-                --app-bg: linear-gradient(315deg, rgba(77, 0, 200, 0.03) 0%, rgba(29, 48, 78, 0.03) 100%), white;
-            }
-
-            /* 기본 배경/폰트 */
-            html, body, .stApp, [data-testid="stAppViewContainer"], [data-testid="stSidebar"] {
-                background: var(--app-bg) !important;
-                color: var(--black-color) !important;
-            }
-            body { font-family: 'Noto Sans KR', sans-serif !important; }
-
-            /* 헤더 / 푸터 숨김 */
-            header[data-testid="stHeader"], footer { display: none !important; }
-
-            div.block-container { padding: 1.5rem 1rem 3rem 1rem !important; }
-
-            /* Form wrapper 제거 */
-            .stForm, div[data-testid="stForm"], div[data-testid="stForm"] > div {
-                background: transparent !important; border: none !important; padding: 0 !important; margin: 0 !important; box-shadow: none !important; display: contents !important; 
-            }
-
-            /* 헤더 */
-            .header-group { display: flex; flex-direction: column; align-items: flex-start; gap: 12px; margin-bottom: 20px; }
-            .icon-container { 
-                width: 68px; height: 68px; padding: 8px; background: var(--icon-bg-color); border-radius: 50%; display: flex; justify-content: center; align-items: center; flex-shrink: 0; }
-            .icon-container img { width: 52px; height: 52px; display: block; object-fit: contain; }
-            .title-group { display: flex; flex-direction: column; align-items: flex-start; gap: 8px; }
-            .main-title { font-size: 20px; font-weight: 700; line-height: 32px; color: var(--black-color) !important; }
-            .main-subtitle { font-size: 13px; font-weight: 400; line-height: 20px; color: var(--secondary-color) !important; }
-
-            /* 상단 메뉴 */
-            div[data-testid="stHorizontalBlock"] {
-                background: white !important; border: 1px solid var(--divider-color) !important; border-radius: 12px; padding: 4px !important; margin-bottom: 20px; }
-            div[data-testid="stHorizontalBlock"] .stButton button {
-                background: transparent !important; color: var(--secondary-color) !important; border-radius: 8px; font-size: 12px; font-weight: 400; border: none; padding: 10px 4px; }
-            div[data-testid="stHorizontalBlock"] .stButton button[kind="primary"] {
-                background: var(--primary-color) !important; color: white !important; font-weight: 700; box-shadow: 0px 2px 2px rgba(0, 0, 0, 0.02); }
-
-            /* 입력폼 */
-            .form-section { display: flex; flex-direction: column; align-items: flex-start; gap: 12px; width: 100%; padding-bottom: 20px; margin-bottom: 20px; border-bottom: 1px solid var(--divider-color); }
-            .input-label { font-size: 18px; font-weight: 700; line-height: 28px; color: var(--black-color); }
-            .input-label.light { font-weight: 400; }
-            .stTextInput, .stTextArea { width: 100%; }
-            .stTextInput input, .stTextArea textarea {
-                background-color: white !important; border: 1px solid var(--divider-color) !important; border-radius: 12px !important; color: var(--black-color) !important; }
-            .stTextArea textarea { min-height: 81px; }
-            
-            /* ================================================================== */
-            /* ===== ✨ 버튼 스타일 - Figma Design (강제 적용) ✨ ===== */
-            /* ================================================================== */
-            /* '전략 저장하기' (폼 제출) 버튼과 'AI 추천' 버튼에 대한 공통 스타일 */
-            div[data-testid="stForm"] button[type="submit"],
-            div[data-testid="stForm"] button[kind="secondaryFormSubmit"],
-            .stForm button[type="submit"],
-            button[kind="secondaryFormSubmit"],
-            .styled-button-container .stButton button,
-            .styled-button-container button {
-                width: 100% !important;
-                padding: 14px 36px !important;
-                font-size: 14px !important;
-                font-weight: 400 !important;
-                line-height: 20px !important;
-                color: white !important;
-                background-color: #2BA7D1 !important;
-                background-image: linear-gradient(135deg, rgba(98, 120.20, 246, 0.20) 0%, rgba(29, 48, 78, 0) 100%) !important;
-                background: linear-gradient(135deg, rgba(98, 120.20, 246, 0.20) 0%, rgba(29, 48, 78, 0) 100%), #2BA7D1 !important;
-                border: none !important;
-                border-radius: 12px !important;
-                box-shadow: 0px 5px 10px rgba(26, 26, 26, 0.10) !important;
-                transition: all 0.3s ease !important;
-                margin-top: 20px !important;
-            }
-
-            /* 버튼 호버(마우스 올렸을 때) 효과 */
-            div[data-testid="stForm"] button[type="submit"]:hover,
-            div[data-testid="stForm"] button[kind="secondaryFormSubmit"]:hover,
-            .stForm button[type="submit"]:hover,
-            button[kind="secondaryFormSubmit"]:hover,
-            .styled-button-container .stButton button:hover,
-            .styled-button-container button:hover {
-                color: white !important;
-                background-color: #1A8BB0 !important;
-                background-image: linear-gradient(135deg, rgba(98, 120.20, 246, 0.30) 0%, rgba(29, 48, 78, 0) 100%) !important;
-                background: linear-gradient(135deg, rgba(98, 120.20, 246, 0.30) 0%, rgba(29, 48, 78, 0) 100%), #1A8BB0 !important;
-                border: none !important;
-                box-shadow: 0px 6px 14px rgba(26, 26, 26, 0.15) !important;
-                transform: translateY(-2px) !important;
-            }
-
-            /* 버튼 포커스(클릭 또는 Tab으로 선택 시) 효과 - 기본 테두리 제거 */
-            div[data-testid="stForm"] button[type="submit"]:focus,
-            div[data-testid="stForm"] button[kind="secondaryFormSubmit"]:focus,
-            .stForm button[type="submit"]:focus,
-            button[kind="secondaryFormSubmit"]:focus,
-            .styled-button-container .stButton button:focus,
-            .styled-button-container button:focus {
-                outline: none !important;
-                box-shadow: 0px 6px 14px rgba(26, 26, 26, 0.15) !important;
-                background-color: #2BA7D1 !important;
-                background: linear-gradient(135deg, rgba(98, 120.20, 246, 0.20) 0%, rgba(29, 48, 78, 0) 100%), #2BA7D1 !important;
-            }
-            /* ================================================================== */
-
-            /* 목록 */
-            .list-container { margin-top: 40px; }
-            .list-header { display: flex; flex-direction: column; gap: 4px; margin-bottom: 12px; }
-            .list-header .label { font-size: 12px; color: var(--secondary-color); }
-            .list-header .title { font-size: 18px; font-weight: 700; line-height: 28px; color: var(--black-color); }
-            
-            .strategy-item { padding: 16px 8px; border-bottom: 1px solid var(--divider-color); }
-            .strategy-item:last-child { border-bottom: none; }
-            .strategy-item .stButton button {
-                background-color: var(--divider-color) !important; color: var(--secondary-color) !important; font-size: 12px; border-radius: 8px; border: none; }
-            
-            /* 명예의 전당 카드 */
-            .hall-of-fame-card {
-                background-color: white; border: 1px solid var(--divider-color); border-radius: 12px; padding: 1rem 1.2rem; margin-bottom: 1rem;}
-
-            /* 반응형 디자인 */
-            @media (max-width: 640px) {
-                div.block-container { padding: 1rem 1rem 2rem 1rem !important; }
-                .main-title { font-size: 18px; }
-                .main-subtitle { font-size: 12px; }
-                .input-label { font-size: 16px; }
-                .list-header .title { font-size: 16px; }
-                .header-group { flex-direction: row; align-items: center; }
-            }
-        </style>
-    """,
+        '<div class="list-header"><p class="label">큰틀전략</p><p class="title">AI 코치의 큰틀전략</p></div>',
         unsafe_allow_html=True,
     )
+    for item in strategies:
+        st.markdown('<div class="strategy-item">', unsafe_allow_html=True)
+        st.markdown(f"##### 💡 {item['strategy']}")
+        st.caption(item["explanation"])
+        st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# --- 지표 내보내기 ---
+@st.cache_resource
+def start_metrics_export():
+    """공용 자원 상태를 지표에 연결하고, 설정에 따라 /metrics 서버를 띄웁니다.
+
+    METRICS_PORT가 있으면 그 포트에서 Prometheus 형식을 제공하고,
+    METRICS_FILE이 있으면 같은 내용을 주기적으로 파일에 씁니다.
+    """
+    cache = get_response_cache()
+    limiter = get_rate_limiter()
+    runner = get_job_runner()
+    cache_gauge = metrics.REGISTRY.gauge(
+        "strategymaker_response_cache", "Response cache counters and size."
+    )
+    limiter_waiters = metrics.REGISTRY.gauge(
+        "strategymaker_rate_limit_waiters", "Requests waiting for a Gemini token."
+    )
+    active_jobs = metrics.REGISTRY.gauge(
+        "strategymaker_active_ai_jobs", "Running background AI jobs."
+    )
+
+    def collect():
+        for name, value in cache.stats().items():
+            if value is not None:
+                cache_gauge.set(value, stat=name)
+        limiter_waiters.set(limiter.stats()["waiters"])
+        active_jobs.set(runner.active_count())
+
+    metrics.REGISTRY.add_collector(collect)
+    if os.getenv("METRICS_PORT"):
+        metrics.start_http_server(int(os.getenv("METRICS_PORT")))
+    if os.getenv("METRICS_FILE"):
+        return metrics.FileExporter(
+            os.getenv("METRICS_FILE"),
+            interval_seconds=float(os.getenv("METRICS_FILE_INTERVAL", "15")),
+        ).start()
+    return None
+
+
+# --- 로컬 추천 색인 ---
+def build_recommender(hall_of_fame, cache, store):
+    """명예의 전당, 지금까지 생성된 AI 전략, 저장된 전략으로 로컬 추천 색인을 만듭니다."""
+    # NumPy는 로컬 추천을 처음 쓸 때 불러옵니다.
+    from recommender import StrategyIndex
+
+    with startup_timing.timed("recommender_index"):
+        index = StrategyIndex()
+        for i, record in enumerate(hall_of_fame.records):
+            index.add(
+                ("hof", i),
+                record["전략"],
+                {
+                    "strategy": record["전략"],
+                    "explanation": f"{record['선수']} ({record['종목']})",
+                    "source": "명예의 전당",
+                },
+            )
+        for situation, strategies in cache.entries(CACHE_MODEL_KEY):
+            index_ai_strategies(index, situation, strategies)
+        for row in store.iter_all():
+            index_my_strategy(
+                index, row["id"], row["owner"], row["name"], row["strategy"]
+            )
+    return index
+
+
+@st.cache_resource
+def get_recommender():
+    """로컬 추천 색인을 백그라운드 스레드에서 만들기 시작하고 그 Future를 돌려줍니다.
+
+    색인은 모든 사용자의 전략과 캐시된 AI 답을 읽어 수 초가 걸릴 수 있어
+    검색 클릭에서 만들지 않습니다. 다 만들어지기 전에는 로컬 추천이 비어 있습니다.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recommender")
+    future = executor.submit(
+        build_recommender,
+        get_hall_of_fame(),
+        get_response_cache(),
+        get_strategy_store(),
+    )
+    # 색인을 다 만들면 스레드도 정리되도록 합니다.
+    executor.shutdown(wait=False)
+
+    def log_failure(future):
+        if future.exception() is not None:
+            logger.error("로컬 추천 색인을 만들지 못했습니다: %s", future.exception())
+
+    future.add_done_callback(log_failure)
+    return future
+
+
+def update_recommender(update):
+    """색인에 update(index)를 적용합니다. 아직 만드는 중이면 다 만든 뒤에 적용합니다.
+
+    만드는 도중 저장소에 들어간 전략은 두 번 더해질 수 있지만 같은 키는 무시됩니다.
+    """
+    if LOCAL_RECOMMEND_MODE == "off":
+        return
+
+    def apply(future):
+        if future.exception() is None:
+            update(future.result())
+
+    get_recommender().add_done_callback(apply)
+
+
+def search_recommender(query, owner):
+    """색인이 준비되었으면 로컬 추천을 찾고, 아직 만드는 중이면 빈 목록을 돌려줍니다."""
+    future = get_recommender()
+    if not future.done() or future.exception() is not None:
+        return []
+    return future.result().search(
+        query, owner=owner, min_score=LOCAL_RECOMMEND_MIN_SCORE
+    )
+
+
+def index_ai_strategies(index, situation, strategies):
+    """AI가 만든 전략을 원래 상황 설명과 함께 색인에 넣습니다."""
+    for item in strategies:
+        index.add(
+            ("ai", item["strategy"]),
+            f"{situation or ''} {item['strategy']} {item['explanation']}",
+            {**item, "source": "AI 코치"},
+        )
+
+
+def index_my_strategy(index, strategy_id, owner_id, name, strategy):
+    """저장된 전략을 본인에게만 보이도록 색인에 넣습니다."""
+    index.add(
+        ("my", strategy_id),
+        strategy,
+        {
+            "strategy": strategy,
+            "explanation": f"작성자: {name}",
+            "source": "나의 큰틀전략",
+        },
+        owner=owner_id,
+    )
+
+
+def render_local_matches(matches):
+    """로컬 색인에서 바로 찾은 비슷한 전략 카드 목록을 그립니다."""
+    st.markdown('<div class="list-container">', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="list-header"><p class="label">바로 찾은 전략</p><p class="title">비슷한 상황의 큰틀전략</p></div>',
+        unsafe_allow_html=True,
+    )
+    for item in matches:
+        st.markdown('<div class="strategy-item">', unsafe_allow_html=True)
+        st.markdown(f"##### 📌 {item['strategy']}")
+        st.caption(f"{item['explanation']} · {item['source']}")
+        st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+AI_BUSY_MESSAGE = "지금 AI 코치를 찾는 분이 많아요. 잠시 후 다시 시도해주세요."
+
+
+def get_coach_state(create=False):
+    """AI 코치 세션 상태를 돌려줍니다. 아직 쓴 적이 없으면 create일 때만 만듭니다."""
+    state = st.session_state.get("coach")
+    if state is None and create:
+        state = st.session_state.coach = CoachState()
+    return state
+
+
+def start_ai_job(user_prompt):
+    """AI 생성 작업을 백그라운드에 맡기고, 새로 시작했는지를 돌려줍니다."""
+    state = get_coach_state(create=True)
+    # 백엔드/캐시/스레드 풀은 스크립트 스레드에서 꺼내 작업에 넘겨줍니다.
+    backend = get_llm_backend()
+    cache = get_response_cache()
+    executor = get_ai_executor()
+    limiter = get_rate_limiter()
+    flights = get_single_flight()
+    _, created = get_job_runner().submit(
+        st.session_state.session_key,
+        lambda job: generate_ai_strategies(
+            user_prompt,
+            backend,
+            cache,
+            executor,
+            limiter,
+            flights,
+            on_strategy=job.publish,
+            check=job.check,
+        ),
+        AI_JOB_DEADLINE,
+    )
+    if created:
+        # 상황과 대화 기록은 결과가 도착했을 때 바꿉니다. 그 전에는 이전 결과를 그대로 둡니다.
+        state.pending = (
+            user_prompt,
+            build_situation_message(user_prompt) if AI_COACH_MODE == "chat" else None,
+        )
+    return created
+
+
+def ask_followup():
+    """후속 질문 버튼 콜백: 지금까지의 대화에 이어 질문만 보내는 작업을 시작합니다."""
+    message = st.session_state.get("ai_followup", "").strip()
+    state = get_coach_state(create=True)
+    runner = get_job_runner()
+    limiter = get_rate_limiter()
+    if not message:
+        state.notice = ("warning", "이어서 물어볼 내용을 입력해주세요.")
+        return
+    if runner.get(st.session_state.session_key) is not None:
+        state.notice = ("info", "이미 전략을 구상 중입니다. 잠시만 기다려주세요.")
+        return
+    if limiter.stats()["waiters"] >= limiter.max_waiters:
+        state.notice = ("warning", AI_BUSY_MESSAGE)
+        return
+    backend = get_llm_backend()
+    history = state.chat
+    runner.submit(
+        st.session_state.session_key,
+        lambda job: continue_coach_chat(
+            history,
+            message,
+            backend,
+            limiter,
+            on_strategy=job.publish,
+            check=job.check,
+        ),
+        AI_JOB_DEADLINE,
+    )
+    state.pending = (None, message)
+    st.session_state.ai_followup = ""
+
+
+def render_followup_input():
+    """chat 모드에서 결과 아래에 이어서 질문하는 입력창을 그립니다."""
+    st.text_input(
+        "ai_followup_input",
+        key="ai_followup",
+        placeholder="예: 두 번째 전략 같은 걸 더 보여줘요, 시합 당일용으로 바꿔줘요",
+        label_visibility="collapsed",
+    )
+    st.markdown('<div class="styled-button-container">', unsafe_allow_html=True)
+    st.button("이어서 물어보기", use_container_width=True, on_click=ask_followup)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+@st.fragment(run_every=AI_POLL_INTERVAL)
+@metrics.span("fragment", fragment="ai_job_panel")
+@profiled("fragment-ai_job_panel")
+def ai_job_panel():
+    """진행 중인 AI 작업을 주기적으로 확인해 완성된 전략부터 보여줍니다."""
+    runner = get_job_runner()
+    job = runner.get(st.session_state.session_key)
+    if job is None:
+        st.rerun()
+    if job.running:
+        st.caption("AI 코치가 당신만을 위한 전략을 구상 중입니다...")
+        if job.partial:
+            render_ai_strategies(job.partial)
+        if st.button("취소", key="cancel_ai_job"):
+            runner.cancel(st.session_state.session_key)
+            st.rerun()
+        return
+
+    # 작업이 끝났으면 결과를 세션에 옮기고 전체 화면을 한 번 다시 그립니다.
+    runner.pop(st.session_state.session_key)
+    state = get_coach_state(create=True)
+    situation, message = state.pending or (None, None)
+    if job.status == "done" and not job.result:
+        # 빈 응답이면 이전 전략과 대화를 그대로 두고 알리기만 합니다.
+        state.notice = (
+            "warning",
+            "AI 응답에서 전략을 찾지 못했습니다. 다시 시도해주세요.",
+        )
+    elif job.status == "done":
+        if situation is not None:
+            # 새 상황이면 대화를 처음부터 시작합니다.
+            state.situation = situation
+            state.chat = ()
+        state.strategies = tuple(job.result)
+        if message is not None:
+            state.chat = trim_history(
+                state.chat
+                + (("user", message), ("model", format_strategies(job.result))),
+                AI_CHAT_TOKEN_BUDGET,
+            )
+        update_recommender(
+            lambda index, situation=state.situation, strategies=job.result: (
+                index_ai_strategies(index, situation, strategies)
+            )
+        )
+    elif job.status == "failed" and isinstance(job.error, RateLimitBusy):
+        state.notice = ("warning", AI_BUSY_MESSAGE)
+    elif job.status == "failed":
+        state.notice = (
+            "error",
+            f"AI 호출 중 오류가 발생했습니다: {job.error}",
+        )
+    elif job.status == "timeout":
+        state.notice = (
+            "error",
+            "AI 응답이 너무 오래 걸려 요청을 중단했습니다.",
+        )
+    state.pending = None
+    st.rerun()
 
 
 # --- Streamlit Secrets에서 API 키 가져오기 ---
-try:
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    genai.configure(api_key=GEMINI_API_KEY)
-    api_key_configured = True
-except (KeyError, AttributeError):
-    api_key_configured = False
+# SDK import와 클라이언트 생성은 AI 코치를 처음 쓸 때 get_llm_backend()에서 합니다.
+api_key_configured = llm.is_configured(LLM_BACKEND)
 
 # --- 데이터 및 상태 초기화 ---
 if "menu" not in st.session_state:
     st.session_state.menu = "✍️ 나의 큰틀전략"
-if "my_strategies" not in st.session_state:
-    st.session_state.my_strategies = pd.DataFrame(columns=["이름", "큰틀전략"])
-if "ai_strategies" not in st.session_state:
-    st.session_state.ai_strategies = []
+if "session_key" not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
+if "owner_id" not in st.session_state:
+    st.session_state.owner_id = get_owner_id()
 
 # --- UI 렌더링 시작 ---
-apply_ui_styles()
+with metrics.span("styles"):
+    apply_ui_styles()
 
 # --- 헤더 UI ---
-icon_path = Path("icon.png")
-icon_base_64 = img_to_base_64(str(icon_path))
+with metrics.span("header"):
+    manifest, _ = get_static_assets()
 
-st.markdown('<div class="header-group">', unsafe_allow_html=True)
-if icon_base_64:
+    st.markdown('<div class="header-group">', unsafe_allow_html=True)
+    if "icon_png" in manifest:
+        st.markdown(
+            '<div class="icon-container"><picture>'
+            f'<source srcset="{static_assets.static_url(manifest["icon_webp"])}" type="image/webp">'
+            f'<img src="{static_assets.static_url(manifest["icon_png"])}" width="52" height="52" alt="App Icon">'
+            "</picture></div>",
+            unsafe_allow_html=True,
+        )
     st.markdown(
-        f'<div class="icon-container"><img src="data:image/png;base64,{icon_base_64}" alt="App Icon"></div>',
+        '<div class="title-group"><p class="main-title">큰틀전략</p><p class="main-subtitle">나만의 다짐을 기록하고, AI에게 영감을 얻고,<br>레전드에게 배우는 멘탈 관리</p></div>',
         unsafe_allow_html=True,
     )
-st.markdown(
-    '<div class="title-group"><p class="main-title">큰틀전략</p><p class="main-subtitle">나만의 다짐을 기록하고, AI에게 영감을 얻고,<br>레전드에게 배우는 멘탈 관리</p></div>',
-    unsafe_allow_html=True,
-)
-st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
 
 
 # --- 상단 메뉴 UI ---
@@ -227,9 +823,16 @@ for i, item in enumerate(menu_items):
         )
 
 # --- 메인 화면 로직 ---
+# 메뉴 본문은 각각 fragment로 그려서, 본문 안의 입력/버튼 조작은 해당 본문만
+# 다시 실행합니다. 스타일/헤더/메뉴는 페이지 로드나 메뉴 전환 때만 다시 그립니다.
+
 
 # 1. '나의 큰틀전략' 메뉴
-if st.session_state.menu == "✍️ 나의 큰틀전략":
+@st.fragment
+@metrics.span("fragment", fragment="my_strategy_section")
+@profiled("fragment-my_strategy_section")
+def my_strategy_section():
+    """전략 입력 폼과 나의 큰틀전략 목록을 그립니다."""
     with st.form("my_strategy_form"):
         st.markdown('<div class="form-section">', unsafe_allow_html=True)
         st.markdown(
@@ -266,42 +869,36 @@ if st.session_state.menu == "✍️ 나의 큰틀전략":
             and st.session_state.get("user_name")
             and st.session_state.get("user_strategy")
         ):
-            new_data = pd.DataFrame(
-                {
-                    "이름": [st.session_state.user_name],
-                    "큰틀전략": [st.session_state.user_strategy],
-                }
+            strategy_id = get_strategy_store().add(
+                st.session_state.owner_id,
+                st.session_state.user_name,
+                st.session_state.user_strategy,
             )
-            st.session_state.my_strategies = pd.concat(
-                [st.session_state.my_strategies, new_data], ignore_index=True
+            owner_id = st.session_state.owner_id
+            name = st.session_state.user_name
+            strategy = st.session_state.user_strategy
+            update_recommender(
+                lambda index: index_my_strategy(
+                    index, strategy_id, owner_id, name, strategy
+                )
             )
+            # 방금 저장한 전략이 보이도록 첫 페이지로 돌아갑니다.
+            st.session_state.my_strategy_cursors = [None]
             st.success("새로운 큰틀전략이 저장되었습니다!")
 
-    if not st.session_state.my_strategies.empty:
-        st.markdown('<div class="list-container">', unsafe_allow_html=True)
-        st.markdown(
-            '<div class="list-header"><p class="label">큰틀전략</p><p class="title">나의 큰틀전략 목록</p></div>',
-            unsafe_allow_html=True,
-        )
-        for index, row in reversed(list(st.session_state.my_strategies.iterrows())):
-            st.markdown('<div class="strategy-item">', unsafe_allow_html=True)
-            col1, col2 = st.columns([0.8, 0.2])
-            with col1:
-                st.caption(f"작성자: {row['이름']}")
-                st.write(f"**{row['큰틀전략']}**")
-            with col2:
-                if st.button("삭제", key=f"delete_{index}", use_container_width=True):
-                    st.session_state.my_strategies = (
-                        st.session_state.my_strategies.drop(index).reset_index(
-                            drop=True
-                        )
-                    )
-                    st.rerun()
-            st.markdown("</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+    my_strategy_list()
+
 
 # 2. 'AI 전략 코치' 메뉴
-elif st.session_state.menu == "🤖 AI 전략 코치":
+@st.fragment
+@metrics.span("fragment", fragment="ai_coach_section")
+@profiled("fragment-ai_coach_section")
+def ai_coach_section():
+    """AI 코치 입력창과 추천 결과를 그립니다."""
+    ai_button_clicked = False
+    if LOCAL_RECOMMEND_MODE != "off":
+        # 검색하기 전에 색인을 백그라운드에서 만들기 시작합니다.
+        get_recommender()
     if not api_key_configured:
         st.error("AI 코치 기능을 사용하기 위한 API 키가 설정되지 않았습니다.")
     else:
@@ -323,136 +920,149 @@ elif st.session_state.menu == "🤖 AI 전략 코치":
         ai_button_clicked = st.button("AI에게 추천받기", use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
-        if ai_button_clicked:
-            if user_prompt:
-                with st.spinner("AI 코치가 당신만을 위한 전략을 구상 중입니다..."):
-                    try:
-                        model = genai.GenerativeModel("gemini-2.0-flash")
-                        prompt = f"""
-                        You are a world-class performance psychologist who creates 'Big-Picture Strategies' (큰틀전략) for athletes. An athlete is facing this situation: '{user_prompt}'.
-                        Generate THREE completely different 'Big-Picture Strategies' for them in KOREAN. Each strategy must come from a unique psychological angle.
-                        For each strategy, provide: - **[전략]**: The core strategy phrase. - **[해설]**: A detailed and helpful explanation of about 3-4 sentences. Explain the psychological principle behind the strategy and how the athlete can apply it in their situation.
-                        Format the output exactly like this, separating each with '---':
-                        [전략]: (Strategy in Korean)
-                        [해설]: (Detailed explanation in Korean)
-                        ---
-                        (Repeat for all three strategies)
-                        """
-                        response = model.generate_content(prompt)
-                        st.session_state.ai_strategies = []
-                        text_out = getattr(response, "text", None) or ""
-                        for block in text_out.split("---"):
-                            if "[전략]:" in block and "[해설]:" in block:
-                                strategy = (
-                                    block.split("[전략]:")[1]
-                                    .split("[해설]:")[0]
-                                    .strip()
-                                )
-                                explanation = block.split("[해설]:")[1].strip()
-                                st.session_state.ai_strategies.append(
-                                    {"strategy": strategy, "explanation": explanation}
-                                )
-                    except Exception as e:
-                        st.error(f"AI 호출 중 오류가 발생했습니다: {e}")
-            else:
-                st.warning("현재 상황을 입력해주세요.")
+    if ai_button_clicked:
+        if user_prompt:
+            matches = []
+            if LOCAL_RECOMMEND_MODE != "off":
+                matches = search_recommender(user_prompt, st.session_state.owner_id)
+            get_coach_state(create=True).local_matches = tuple(
+                item for _, item in matches
+            )
+            limiter = get_rate_limiter()
+            if LOCAL_RECOMMEND_MODE == "fallback" and matches:
+                # 충분히 비슷한 전략이 있으면 AI를 호출하지 않습니다.
+                pass
+            elif limiter.stats()["waiters"] >= limiter.max_waiters:
+                # 대기열이 이미 가득 차 있으면 작업을 만들지 않고 바로 알립니다.
+                st.warning(AI_BUSY_MESSAGE)
+            elif not start_ai_job(user_prompt):
+                st.info("이미 전략을 구상 중입니다. 잠시만 기다려주세요.")
+        else:
+            st.warning("현재 상황을 입력해주세요.")
 
-    if st.session_state.ai_strategies:
-        st.markdown('<div class="list-container">', unsafe_allow_html=True)
-        st.markdown(
-            '<div class="list-header"><p class="label">큰틀전략</p><p class="title">AI 코치의 큰틀전략</p></div>',
-            unsafe_allow_html=True,
-        )
-        for item in st.session_state.ai_strategies:
-            st.markdown('<div class="strategy-item">', unsafe_allow_html=True)
-            st.markdown(f"##### 💡 {item['strategy']}")
-            st.caption(item["explanation"])
-            st.markdown("</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+    state = get_coach_state()
+    if state is None:
+        return
+    if state.notice:
+        level, message = state.notice
+        state.notice = None
+        getattr(st, level)(message)
 
-# 3. '명예의 전당' 메뉴
-elif st.session_state.menu == "🏆 명예의 전당":
-    athletes_data = [
-        {
-            "선수": "김연아",
-            "종목": "피겨 스케이팅",
-            "전략": "무슨 일이 있더라도, 내가 할 수 있는 것에만 집중하고 최선을 다할 뿐이다.",
-        },
-        {
-            "선수": "마이클 조던",
-            "종목": "농구",
-            "전략": "한계에 부딪히더라도, 그건 환상일 뿐이다.",
-        },
-        {"선수": "박지성", "종목": "축구", "전략": "쓰러질지언정 무릎은 꿇지 않는다."},
-        {
-            "선수": "손흥민",
-            "종목": "축구",
-            "전략": "어제의 기쁨은 어제로 끝내고, 새로운 날을 준비한다.",
-        },
-        {
-            "선수": "이상혁 '페이커'",
-            "종목": "e스포츠",
-            "전략": "방심하지 않고, 이기든 지든 내 플레이를 하자.",
-        },
-        {
-            "선수": "박태환",
-            "종목": "수영",
-            "전략": "심장이 터질 것 같아도, 포기하지 않으면 내일이 온다.",
-        },
-        {
-            "선수": "장미란",
-            "종목": "역도",
-            "전략": "들 수 없는 바벨은 없다. 내가 들지 못했을 뿐이다.",
-        },
-        {
-            "선수": "류현진",
-            "종목": "야구",
-            "전략": "마운드 위에서는 내가 최고라는 생각으로 던진다.",
-        },
-        {
-            "선수": "김자인",
-            "종목": "클라이밍",
-            "전략": "가장 높은 곳을 향한 두려움은, 오직 내 안의 작은 속삭임일 뿐이다.",
-        },
-        {
-            "선수": "리오넬 메시",
-            "종목": "축구",
-            "전략": "오늘의 노력이 내일의 나를 만든다.",
-        },
-        {
-            "선수": "타이거 우즈",
-            "종목": "골프",
-            "전략": "아무리 힘들어도, 나는 항상 이길 수 있다고 믿는다.",
-        },
-        {
-            "선수": "우사인 볼트",
-            "종목": "육상",
-            "전략": "나는 한계를 생각하지 않는다. 그저 달릴 뿐이다.",
-        },
-        {
-            "선수": "세레나 윌리엄스",
-            "종목": "테니스",
-            "전략": "나는 다른 사람의 의견으로 나를 정의하지 않는다.",
-        },
-    ]
-    df_athletes = pd.DataFrame(athletes_data)
+    if state.local_matches:
+        render_local_matches(state.local_matches)
+
+    if get_job_runner().get(st.session_state.session_key) is not None:
+        ai_job_panel()
+    elif state.strategies:
+        render_ai_strategies(state.strategies)
+        if AI_COACH_MODE == "chat" and state.chat:
+            render_followup_input()
 
-    sports = ["모두 보기"] + sorted(df_athletes["종목"].unique())
-    selected_sport = st.selectbox("종목별로 보기", sports, label_visibility="collapsed")
 
-    filtered_df = (
-        df_athletes
-        if selected_sport == "모두 보기"
-        else df_athletes[df_athletes["종목"] == selected_sport]
+# 3. '명예의 전당' 메뉴
+@st.cache_resource
+def get_hall_of_fame():
+    """명예의 전당 데이터 파일을 한 번만 읽어 색인과 함께 프로세스 전체가 공유합니다."""
+    return HallOfFame(
+        read_records(os.getenv("HALL_OF_FAME_PATH", "data/hall_of_fame.csv"))
     )
 
-    for index, row in filtered_df.iterrows():
+
+def set_hall_of_fame_page(page):
+    st.session_state.hof_page = page
+
+
+def reset_hall_of_fame_page():
+    st.session_state.hof_page = 0
+
+
+@st.fragment
+@metrics.span("fragment", fragment="hall_of_fame_section")
+@profiled("fragment-hall_of_fame_section")
+def hall_of_fame_section():
+    """종목별로 걸러 볼 수 있는 레전드 선수들의 큰틀전략을 그립니다."""
+    hall = get_hall_of_fame()
+    filter_col, search_col = st.columns([0.4, 0.6])
+    with filter_col:
+        selected_sport = st.selectbox(
+            "종목별로 보기",
+            hall.sports,
+            key="hof_sport",
+            label_visibility="collapsed",
+            on_change=reset_hall_of_fame_page,
+        )
+    with search_col:
+        query = st.text_input(
+            "선수나 전략으로 검색",
+            key="hof_query",
+            placeholder="선수나 전략으로 검색",
+            label_visibility="collapsed",
+            on_change=reset_hall_of_fame_page,
+        )
+
+    matches = hall.search(query, selected_sport)
+    if not matches:
+        st.caption("조건에 맞는 큰틀전략이 없습니다.")
+        return
+    total_pages = -(-len(matches) // HALL_OF_FAME_PAGE_SIZE)
+    page = min(st.session_state.get("hof_page", 0), total_pages - 1)
+
+    for row in hall.page(matches, page, HALL_OF_FAME_PAGE_SIZE):
         st.markdown(
             f"""
         <div class="hall-of-fame-card">
-            <p style="font-size: 14px; color: var(--primary-color); font-weight: 700;">{row["선수"]} <span style="font-size: 12px; color: var(--secondary-color); font-weight: 400;">({row["종목"]})</span></p>
-            <p style="font-size: 16px; color: var(--black-color); margin-top: 8px;">"{row["전략"]}"</p>
+            <p style="font-size: 14px; color: var(--primary-color); font-weight: 700;">{html.escape(row["선수"])} <span style="font-size: 12px; color: var(--secondary-color); font-weight: 400;">({html.escape(row["종목"])})</span></p>
+            <p style="font-size: 16px; color: var(--black-color); margin-top: 8px;">"{html.escape(row["전략"])}"</p>
         </div>
         """,
             unsafe_allow_html=True,
         )
+
+    if total_pages > 1:
+        prev_col, page_col, next_col = st.columns([0.3, 0.4, 0.3])
+        with prev_col:
+            if page > 0:
+                st.button(
+                    "이전",
+                    key="hof_prev",
+                    use_container_width=True,
+                    on_click=set_hall_of_fame_page,
+                    args=(page - 1,),
+                )
+        with page_col:
+            st.caption(f"{page + 1} / {total_pages} 페이지")
+        with next_col:
+            if page < total_pages - 1:
+                st.button(
+                    "다음",
+                    key="hof_next",
+                    use_container_width=True,
+                    on_click=set_hall_of_fame_page,
+                    args=(page + 1,),
+                )
+
+
+try:
+    with profiled(f"menu{menu_items.index(st.session_state.menu)}"):
+        if st.session_state.menu == "✍️ 나의 큰틀전략":
+            my_strategy_section()
+        elif st.session_state.menu == "🤖 AI 전략 코치":
+            ai_coach_section()
+        elif st.session_state.menu == "🏆 명예의 전당":
+            hall_of_fame_section()
+
+    if startup_timing.is_warming_up():
+        # 워밍업 렌더링은 메뉴만 눌러 보므로, 첫 AI 요청이 쓸 자원도 여기서 미리 만듭니다.
+        if api_key_configured:
+            get_llm_backend()
+        if LOCAL_RECOMMEND_MODE != "off":
+            get_recommender().result()
+    startup_timing.record_first_render()
+finally:
+    # --- 재실행 계측 마무리 ---
+    # st.rerun()/st.stop()으로 중간에 끝난 재실행도 기록합니다.
+    RERUN_SECONDS.observe(
+        time.perf_counter() - rerun_started, menu=st.session_state.menu
+    )
+    metrics.SESSIONS.touch(st.session_state.session_key)
+    start_metrics_export()
@@ -0,0 +1,318 @@
+"""여러 선수의 상황을 한꺼번에 AI 코치에 보내 큰틀전략을 만드는 일괄 생성 CLI입니다.
+
+입력은 CSV 또는 JSONL(한 줄에 객체 하나)이고, 각 행의 id/상황 열 이름은
+옵션으로 정합니다. 정해진 수의 작업 스레드가 토큰 버킷 속도 제한을 지키며
+요청을 보내고, 결과는 끝나는 대로 출력 JSONL에 한 줄씩 추가됩니다. 같은
+출력 파일로 다시 실행하면 이미 성공한 id는 건너뛰므로 중간에 멈춰도 이어서
+실행할 수 있습니다.
+
+사용법:
+    python batch.py roster.csv results.jsonl --workers 16 --rps 5
+    LLM_BACKEND=fake python batch.py roster.jsonl results.jsonl --parquet results.parquet
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import llm
+from coach import (
+    DEFAULT_MODEL_NAME,
+    build_coach_prompt,
+    cache_model_key,
+    parse_strategies,
+)
+from ratelimit import TokenBucket
+from response_cache import ResponseCache
+
+
+# --- 입력 읽기 ---
+def read_situations(path, id_field, text_field):
+    """입력 파일에서 (id, 상황) 쌍을 한 행씩 읽어 내보냅니다. id가 없으면 행 번호를 씁니다."""
+    path = Path(path)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for number, row in enumerate(rows, 1):
+            text = (row.get(text_field) or "").strip()
+            if not text:
+                continue
+            row_id = row.get(id_field)
+            yield str(row_id if row_id not in (None, "") else number), text
+
+
+def read_done_ids(path):
+    """이전 실행에서 성공한 id를 읽습니다. 마지막 줄이 잘렸으면 그 줄은 무시합니다."""
+    done = set()
+    try:
+        # 쓰다 멈춘 줄은 UTF-8 글자 중간에서 잘렸을 수 있어 바이트로 읽습니다.
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("status") == "ok":
+                    done.add(str(record["id"]))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def trim_partial_line(path, chunk_size=64 * 1024):
+    """마지막 줄이 줄바꿈 없이 잘려 있으면 잘라 냅니다. 이어 쓰는 기록이 그 줄에 붙지 않게 합니다."""
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+# --- 생성 작업 ---
+class BatchGenerator:
+    """상황 하나를 전략 목록으로 바꿉니다. 여러 작업 스레드가 함께 씁니다."""
+
+    def __init__(
+        self, backend, model_key, limiter, cache=None, timeout=30.0, retries=2
+    ):
+        self.backend = backend
+        self.model_key = model_key
+        self.limiter = limiter
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+
+    def run(self, row_id, situation):
+        start = time.perf_counter()
+        prompt = build_coach_prompt(situation)
+        record = {"id": row_id, "situation": situation, "cached": False}
+        strategies = self.cache.get(self.model_key, prompt) if self.cache else None
+        error = None
+        if strategies is not None:
+            record["cached"] = True
+        else:
+            for attempt in range(self.retries + 1):
+                try:
+                    # 속도 제한 대기는 작업 스레드 수를 넘지 않으므로 충분히 기다립니다.
+                    self.limiter.acquire(timeout=self.timeout * 10)
+                    strategies = parse_strategies(
+                        self.backend.generate(prompt, timeout=self.timeout)
+                    )
+                    if strategies:
+                        break
+                    error = "응답에서 전략을 찾지 못했습니다."
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                if attempt < self.retries:
+                    time.sleep(min(2**attempt, 10))
+            if strategies and self.cache:
+                self.cache.set(self.model_key, prompt, strategies, label=situation)
+        record["status"] = "ok" if strategies else "error"
+        record["strategies"] = strategies or []
+        if not strategies:
+            record["error"] = error
+        record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return record
+
+
+# --- 진행 상황 보고 ---
+class Progress:
+    """처리량과 지연 시간을 모아 주기적으로 stderr에 출력합니다."""
+
+    def __init__(self, interval=5.0):
+        self.started = time.perf_counter()
+        self.skipped = 0
+        self.interval = interval
+        self.done = 0
+        self.errors = 0
+        self.cached = 0
+        self.latencies = []
+        self._last_report = self.started
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        with self._lock:
+            self.done += 1
+            self.errors += record["status"] != "ok"
+            self.cached += record["cached"]
+            self.latencies.append(record["elapsed_ms"])
+            now = time.perf_counter()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                print(self.line(), file=sys.stderr, flush=True)
+
+    def line(self):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        return (
+            f"완료 {self.done} (오류 {self.errors}, 캐시 {self.cached}, "
+            f"건너뜀 {self.skipped}) | {rate:.2f}건/초 | {elapsed:.1f}초"
+        )
+
+    def summary(self):
+        ordered = sorted(self.latencies)
+
+        def pick(q):
+            return (
+                ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0
+            )
+
+        elapsed = time.perf_counter() - self.started
+        return {
+            "done": self.done,
+            "errors": self.errors,
+            "cached": self.cached,
+            "skipped": self.skipped,
+            "seconds": round(elapsed, 2),
+            "per_second": round(self.done / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99)},
+        }
+
+
+def run_batch(rows, generator, output_path, workers, progress):
+    """작업을 최대 workers*2개까지만 대기시키며 실행하고, 끝나는 대로 결과를 씁니다."""
+    max_pending = workers * 2
+    trim_partial_line(output_path)
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="batch"
+    ) as executor:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending
+            finished, pending = wait(pending, return_when=return_when)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                progress.record(record)
+
+        for row_id, situation in rows:
+            pending.add(executor.submit(generator.run, row_id, situation))
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+
+
+def write_parquet(jsonl_path, parquet_path):
+    """최종 JSONL에서 id별 마지막 결과만 골라 Parquet로 저장합니다. pyarrow가 필요합니다."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow")
+    latest = {}
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok" or record["id"] not in latest:
+                latest[record["id"]] = record
+    rows = [
+        {
+            "id": r["id"],
+            "situation": r["situation"],
+            "status": r["status"],
+            "strategies": r.get("strategies", []),
+            "error": r.get("error"),
+            "elapsed_ms": r.get("elapsed_ms"),
+        }
+        for r in latest.values()
+    ]
+    strategy = pa.struct([("strategy", pa.string()), ("explanation", pa.string())])
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("situation", pa.string()),
+            ("status", pa.string()),
+            ("strategies", pa.list_(strategy)),
+            ("error", pa.string()),
+            ("elapsed_ms", pa.float64()),
+        ]
+    )
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), parquet_path)
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="큰틀전략 일괄 생성")
+    parser.add_argument("input", help="상황 목록 (.csv 또는 .jsonl)")
+    parser.add_argument("output", help="결과 JSONL 경로 (있으면 이어서 실행)")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--text-field", default="situation")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--rps", type=float, default=float(os.getenv("GEMINI_RPS", "1"))
+    )
+    parser.add_argument(
+        "--burst", type=int, default=int(os.getenv("GEMINI_BURST", "5"))
+    )
+    parser.add_argument("--backend", default=os.getenv("LLM_BACKEND", "gemini"))
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument(
+        "--timeout", type=float, default=float(os.getenv("AI_REQUEST_TIMEOUT", "30"))
+    )
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument(
+        "--cache",
+        default=os.getenv("RESPONSE_CACHE_PATH"),
+        help="앱과 같은 응답 캐시 경로를 주면 결과를 서로 재사용합니다.",
+    )
+    parser.add_argument("--parquet", help="끝난 뒤 결과를 Parquet로도 저장합니다.")
+    args = parser.parse_args(argv)
+
+    if not llm.is_configured(args.backend):
+        sys.exit(f"{args.backend} 백엔드 설정(API 키 등)이 없습니다.")
+    done_ids = read_done_ids(args.output)
+    progress = Progress()
+
+    def pending_rows():
+        for row_id, text in read_situations(args.input, args.id_field, args.text_field):
+            if row_id in done_ids:
+                progress.skipped += 1
+            else:
+                yield row_id, text
+
+    generator = BatchGenerator(
+        llm.make_backend(args.backend, args.model),
+        cache_model_key(args.backend, args.model),
+        # 대기 인원 제한은 작업 스레드 수로 충분합니다.
+        TokenBucket(args.rps, args.burst, max_waiters=args.workers),
+        cache=ResponseCache(args.cache) if args.cache else None,
+        timeout=args.timeout,
+        retries=args.retries,
+    )
+    run_batch(pending_rows(), generator, args.output, args.workers, progress)
+    print(progress.line(), file=sys.stderr)
+    summary = progress.summary()
+    if args.parquet:
+        summary["parquet_rows"] = write_parquet(args.output, args.parquet)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""큰틀전략 앱 벤치마크 / 부하 테스트.
+
+실제 Gemini API 대신 로컬 가짜 백엔드(LLM_BACKEND=fake)를 쓰고, Streamlit
+AppTest로 app.py를 헤드리스 세션 여러 개로 실행해 다음을 측정합니다.
+
+- 메뉴별 스크립트 재실행(rerun) 지연 시간 p50/p95/p99
+- 동시 AI 요청 처리량과 요청별 완료 지연 시간 p50/p95/p99
+- 대기(idle)/사용 중(active) 세션당 메모리 사용량 (tracemalloc 기준)과
+  그중 세션 상태(st.session_state)가 차지하는 바이트 수
+
+결과는 benchmarks/results/ 에 JSON으로 저장되고, 직전 결과와 비교해 출력됩니다.
+
+사용법:
+    python benchmarks/bench_app.py --sessions 20 --reruns 30
+    FAKE_LLM_LATENCY=2 FAKE_LLM_ERROR_RATE=0.05 python benchmarks/bench_app.py
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+MENUS = {
+    "button_0": "✍️ 나의 큰틀전략",
+    "button_1": "🤖 AI 전략 코치",
+    "button_2": "🏆 명예의 전당",
+}
+AI_BUTTON_LABEL = "AI에게 추천받기"
+# 결과에 함께 기록할 설정 환경 변수
+BENCH_ENV_PREFIXES = (
+    "LLM_BACKEND",
+    "FAKE_LLM_",
+    "AI_COACH_MODE",
+    "AI_CHAT_",
+    "AI_REQUEST_TIMEOUT",
+    "AI_HEDGE_AFTER",
+    "AI_JOB_",
+    "AI_WORKERS",
+    "GEMINI_RPS",
+    "GEMINI_BURST",
+    "GEMINI_MAX_WAITERS",
+)
+
+
+def summarize(samples):
+    """지연 시간 목록(ms)을 p50/p95/p99 요약으로 바꿉니다."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def new_session():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=30)
+    at.run()
+    return at
+
+
+def bench_reruns(reruns):
+    """메뉴마다 같은 세션에서 스크립트를 reruns번 다시 실행한 시간을 잽니다."""
+    at = new_session()
+    results = {}
+    for key, label in MENUS.items():
+        at.button(key=key).click().run()
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[label] = summarize(samples)
+    return results
+
+
+def bench_ai(sessions, poll_interval, timeout):
+    """세션 여러 개가 동시에 AI 추천을 요청했을 때의 처리량과 지연 시간을 잽니다.
+
+    완료 시점은 poll_interval 간격으로 세션을 다시 실행해 확인하므로,
+    지연 시간에는 그만큼의 측정 오차가 포함됩니다.
+    """
+    clients = []
+    for i in range(sessions):
+        at = new_session()
+        at.button(key="button_1").click().run()
+        at.text_area[0].input(f"시합 전에 너무 긴장돼요 #{i}").run()
+        clients.append(at)
+
+    started = {}
+    begin = time.perf_counter()
+    for i, at in enumerate(clients):
+        next(b for b in at.button if b.label == AI_BUTTON_LABEL).click().run()
+        started[i] = time.perf_counter()
+
+    latencies = []
+    errors = 0
+    pending = set(started)
+    while pending and time.perf_counter() - begin < timeout:
+        time.sleep(poll_interval)
+        for i in sorted(pending):
+            at = clients[i]
+            at.run()
+            coach = at.session_state.get("coach")
+            if coach is not None and coach.strategies:
+                latencies.append((time.perf_counter() - started[i]) * 1000)
+                pending.discard(i)
+            elif len(at.error) or len(at.warning):
+                errors += 1
+                pending.discard(i)
+    elapsed = time.perf_counter() - begin
+    return {
+        "requests": sessions,
+        "completed": len(latencies),
+        "errors": errors,
+        "timed_out": len(pending),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+    }
+
+
+def deep_sizeof(obj, seen):
+    """obj가 참조하는 객체들의 크기 합입니다. seen에 있는 객체는 다시 세지 않습니다."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(
+            deep_sizeof(getattr(obj, name, None), seen) for name in obj.__slots__
+        )
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def session_state_bytes(clients):
+    """세션들의 상태 크기 평균입니다. 여러 세션이 함께 참조하는 객체는 한 번만 셉니다."""
+    seen = set()
+    total = sum(deep_sizeof(at._session_state.filtered_state, seen) for at in clients)
+    return int(total / max(1, len(clients)))
+
+
+def use_all_menus(at, situation, poll_interval, timeout):
+    """세 메뉴를 모두 열고 AI 추천을 한 번 받아 '사용 중' 세션으로 만듭니다."""
+    at.button(key="button_1").click().run()
+    at.text_area[0].input(situation).run()
+    next(b for b in at.button if b.label == AI_BUTTON_LABEL).click().run()
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        coach = at.session_state.get("coach")
+        if coach is not None and coach.strategies:
+            break
+        time.sleep(poll_interval)
+        at.run()
+    at.button(key="button_2").click().run()
+    at.button(key="button_0").click().run()
+
+
+def bench_memory(sessions, poll_interval, timeout):
+    """대기 세션과 사용 중 세션의 세션당 메모리를 잽니다.
+
+    대기 세션은 첫 화면만 그린 상태이고, 사용 중 세션은 세 메뉴를 모두 열고
+    AI 추천을 한 번 받은 상태입니다.
+    """
+    # 프로세스 공유 자원(캐시, 색인, 모듈)이 세션 비용에 섞이지 않도록 먼저
+    # 모든 경로를 한 번 실행합니다.
+    use_all_menus(new_session(), "워밍업 상황", poll_interval, timeout)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clients = [new_session() for _ in range(sessions)]
+    gc.collect()
+    idle = tracemalloc.get_traced_memory()[0]
+    idle_state = session_state_bytes(clients)
+    for i, at in enumerate(clients):
+        use_all_menus(at, f"시합 전에 너무 긴장돼요 #{i}", poll_interval, timeout)
+    gc.collect()
+    active = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = max(1, len(clients))
+    return {
+        "sessions": len(clients),
+        "idle_bytes_per_session": int((idle - before) / count),
+        "active_bytes_per_session": int((active - before) / count),
+        "idle_state_bytes_per_session": idle_state,
+        "active_state_bytes_per_session": session_state_bytes(clients),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(data, prefix=""):
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+
+def compare(previous, current):
+    """직전 결과와 숫자 지표를 비교해 변화율을 출력합니다."""
+    old = dict(flatten(previous["results"]))
+    print(f"\n직전 결과({previous['revision']}, {previous['timestamp']})와 비교:")
+    for name, value in flatten(current["results"]):
+        if name in old and old[name]:
+            change = (value - old[name]) / old[name] * 100
+            print(f"  {name:<55} {old[name]:>12} -> {value:>12} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20, help="메뉴별 재실행 횟수")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 AI 요청 세션 수")
+    parser.add_argument(
+        "--memory-sessions", type=int, default=10, help="메모리 측정용 세션 수"
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--no-save", action="store_true", help="결과를 저장하지 않음")
+    args = parser.parse_args()
+
+    # 가짜 백엔드와 일회용 캐시/저장소를 쓰고, 속도 제한은 측정을 방해하지 않게 넉넉히 둡니다.
+    # 캐시와 저장소는 환경 변수가 있어도 덮어써 실제 사용자 데이터를 건드리지 않습니다.
+    workdir = tempfile.mkdtemp(prefix="strategymaker-bench-")
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ["RESPONSE_CACHE_PATH"] = str(Path(workdir) / "cache.sqlite3")
+    os.environ["STRATEGY_DB_PATH"] = str(Path(workdir) / "strategies.sqlite3")
+    os.environ.setdefault("GEMINI_RPS", "1000")
+    os.environ.setdefault("GEMINI_BURST", "1000")
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    results = {
+        "rerun_ms": bench_reruns(args.reruns),
+        "ai": bench_ai(args.sessions, args.poll_interval, args.timeout),
+        "memory": bench_memory(args.memory_sessions, args.poll_interval, args.timeout),
+    }
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "args": vars(args),
+        "env": {
+            key: value
+            for key, value in os.environ.items()
+            if key.startswith(BENCH_ENV_PREFIXES)
+        },
+        "results": results,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    previous = sorted(RESULTS_DIR.glob("*.json"))
+    if previous:
+        compare(json.loads(previous[-1].read_text(encoding="utf-8")), report)
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{stamp}-{report['revision']}.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), "utf-8")
+        print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""큰틀전략 앱 콜드 스타트 측정.
+
+새 파이썬 프로세스에서 다음을 측정해 시작 비용이 줄었는지 확인합니다.
+
+- 주요 모듈별 import 시간 (각각 새 프로세스에서, 여러 번 반복한 중앙값)
+- app.py 첫 화면 렌더링 시간 (메뉴별로 새 프로세스에서 AppTest로 실행)
+- AI 코치를 쓰지 않은 세션에서 Gemini SDK가 import되었는지 여부
+
+결과는 benchmarks/results/startup/ 에 JSON으로 저장됩니다.
+
+사용법:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results" / "startup"
+MODULES = ["streamlit", "google.generativeai", "pandas", "numpy", "llm"]
+MENUS = {
+    "button_0": "✍️ 나의 큰틀전략",
+    "button_1": "🤖 AI 전략 코치",
+    "button_2": "🏆 명예의 전당",
+}
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+at.run()
+first = (time.perf_counter() - start) * 1000
+menu_start = time.perf_counter()
+if {button!r} != "button_0":
+    at.button(key={button!r}).click().run()
+print(json.dumps({{
+    "first_render_ms": first,
+    "menu_render_ms": (time.perf_counter() - menu_start) * 1000,
+    "gemini_sdk_loaded": "google.generativeai" in sys.modules,
+}}))
+"""
+
+
+def run_python(code, env):
+    output = subprocess.check_output(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        text=True,
+        stderr=subprocess.DEVNULL,
+    )
+    return output.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--no-save", action="store_true", help="결과를 저장하지 않음")
+    args = parser.parse_args()
+
+    # 실제 사용자 데이터를 건드리지 않도록 캐시와 저장소는 일회용 디렉터리에 둡니다.
+    workdir = Path(tempfile.mkdtemp(prefix="strategymaker-startup-"))
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(ROOT),
+        RESPONSE_CACHE_PATH=str(workdir / "cache.sqlite3"),
+        STRATEGY_DB_PATH=str(workdir / "strategies.sqlite3"),
+    )
+    imports = {}
+    for module in MODULES:
+        samples = [
+            float(run_python(IMPORT_SNIPPET.format(module=module), env))
+            for _ in range(args.repeat)
+        ]
+        imports[module] = round(statistics.median(samples), 2)
+
+    renders = {}
+    for button, label in MENUS.items():
+        samples = [
+            json.loads(run_python(RENDER_SNIPPET.format(button=button), env))
+            for _ in range(args.repeat)
+        ]
+        renders[label] = {
+            "first_render_ms": round(
+                statistics.median(s["first_render_ms"] for s in samples), 2
+            ),
+            "menu_render_ms": round(
+                statistics.median(s["menu_render_ms"] for s in samples), 2
+            ),
+            "gemini_sdk_loaded": samples[-1]["gemini_sdk_loaded"],
+        }
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "import_ms": imports,
+        "render": renders,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), "utf-8")
+        print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
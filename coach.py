@@ -0,0 +1,172 @@
+"""AI 코치 프롬프트와 응답 파서입니다. 앱과 일괄 생성 CLI(batch.py)가 함께 씁니다."""
+
+import metrics
+
+DEFAULT_MODEL_NAME = "gemini-2.0-flash"
+
+PARSE_FAILURES = metrics.REGISTRY.counter(
+    "strategymaker_strategy_parse_failures_total",
+    "Response blocks without the [전략]/[해설] markers.",
+)
+
+
+def cache_model_key(backend_name, model_name):
+    """가짜 백엔드의 응답이 실제 응답 캐시에 섞이지 않도록 캐시 키에 백엔드를 구분합니다."""
+    return model_name if backend_name == "gemini" else f"{backend_name}:{model_name}"
+
+
+# --- AI 코치 프롬프트 및 응답 파싱 ---
+def build_coach_prompt(user_prompt):
+    """사용자 상황을 AI 코치 프롬프트로 만듭니다."""
+    return f"""
+    You are a world-class performance psychologist who creates 'Big-Picture Strategies' (큰틀전략) for athletes. An athlete is facing this situation: '{user_prompt}'.
+    Generate THREE completely different 'Big-Picture Strategies' for them in KOREAN. Each strategy must come from a unique psychological angle.
+    For each strategy, provide: - **[전략]**: The core strategy phrase. - **[해설]**: A detailed and helpful explanation of about 3-4 sentences. Explain the psychological principle behind the strategy and how the athlete can apply it in their situation.
+    Format the output exactly like this, separating each with '---':
+    [전략]: (Strategy in Korean)
+    [해설]: (Detailed explanation in Korean)
+    ---
+    (Repeat for all three strategies)
+    """
+
+
+# fan-out 모드에서 요청 하나가 맡는 심리학적 관점
+STRATEGY_ANGLES = {
+    "reframe": "cognitive reframing: changing how the athlete interprets the situation",
+    "focus": "attentional focus: shifting attention to controllable, process-oriented actions",
+    "regulate": "emotional regulation: managing arousal through body, breathing and self-talk",
+}
+
+
+def build_angle_prompt(user_prompt, angle):
+    """관점 하나에 대한 전략 한 개만 요청하는 프롬프트를 만듭니다."""
+    return f"""
+    You are a world-class performance psychologist who creates 'Big-Picture Strategies' (큰틀전략) for athletes. An athlete is facing this situation: '{user_prompt}'.
+    Generate ONE 'Big-Picture Strategy' for them in KOREAN from this psychological angle: {angle}.
+    Provide: - **[전략]**: The core strategy phrase. - **[해설]**: A detailed and helpful explanation of about 3-4 sentences. Explain the psychological principle behind the strategy and how the athlete can apply it in their situation.
+    Format the output exactly like this:
+    [전략]: (Strategy in Korean)
+    [해설]: (Detailed explanation in Korean)
+    """
+
+
+def _parse_block(block):
+    """'[전략]:'/'[해설]:' 블록 하나를 전략 딕셔너리로 변환합니다."""
+    if "[전략]:" in block and "[해설]:" in block:
+        strategy = block.split("[전략]:")[1].split("[해설]:")[0].strip()
+        explanation = block.split("[해설]:")[1].strip()
+        return {"strategy": strategy, "explanation": explanation}
+    if block.strip():
+        PARSE_FAILURES.inc()
+    return None
+
+
+def parse_strategies(text_out):
+    """'---'로 구분된 AI 응답을 전략/해설 목록으로 변환합니다."""
+    strategies = []
+    for block in text_out.split("---"):
+        item = _parse_block(block)
+        if item:
+            strategies.append(item)
+    return strategies
+
+
+class StrategyStreamParser:
+    """스트리밍 청크를 받아 '---' 블록이 완성될 때마다 전략을 돌려줍니다."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        *blocks, self._buffer = self._buffer.split("---")
+        return [item for item in map(_parse_block, blocks) if item]
+
+    def close(self):
+        item = _parse_block(self._buffer)
+        self._buffer = ""
+        return [item] if item else []
+
+
+# --- 여러 턴 코칭 (chat 모드) ---
+# 대화 내내 바뀌지 않는 지시문입니다. 턴마다 프롬프트에 다시 붙이지 않고
+# 모델의 system instruction으로 한 번만 설정합니다.
+COACH_SYSTEM_INSTRUCTION = """You are a world-class performance psychologist who creates 'Big-Picture Strategies' (큰틀전략) for athletes.
+Unless the athlete asks for a different number, answer with THREE completely different strategies in KOREAN, each from a unique psychological angle.
+For each strategy, provide: - **[전략]**: The core strategy phrase. - **[해설]**: A detailed and helpful explanation of about 3-4 sentences. Explain the psychological principle behind the strategy and how the athlete can apply it in their situation.
+Format every answer exactly like this, separating each with '---':
+[전략]: (Strategy in Korean)
+[해설]: (Detailed explanation in Korean)
+---
+(Repeat for each strategy)
+When the athlete follows up (for example "more like the second one"), build on the strategies you already gave in this conversation."""
+
+
+def build_situation_message(user_prompt):
+    """대화의 첫 메시지입니다. 지시문 없이 상황만 담습니다."""
+    return f"An athlete is facing this situation: '{user_prompt}'."
+
+
+def format_strategies(strategies):
+    """전략 목록을 응답 형식의 텍스트로 되돌립니다. 대화 기록에 모델 답으로 넣습니다."""
+    return "\n---\n".join(
+        f"[전략]: {item['strategy']}\n[해설]: {item['explanation']}"
+        for item in strategies
+    )
+
+
+def estimate_tokens(text):
+    """글자 수로 토큰 수를 어림합니다. 영문은 약 4글자, 한글은 약 1글자가 1토큰입니다."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def trim_history(history, budget):
+    """대화 기록을 토큰 예산 안으로 줄입니다.
+
+    첫 질문/답(상황 설명)과 가장 최근 질문/답은 항상 남기고, 그 사이는 예산이
+    허락하는 만큼 최근 것부터 남깁니다. 질문/답은 짝으로 다룹니다.
+    """
+    history = tuple(history)
+    if len(history) <= 4:
+        return history
+    head, middle, last = history[:2], history[2:-2], history[-2:]
+    used = sum(estimate_tokens(text) for _, text in head + last)
+    kept = ()
+    for end in range(len(middle), 0, -2):
+        pair = middle[end - 2 : end]
+        cost = sum(estimate_tokens(text) for _, text in pair)
+        if used + cost > budget:
+            break
+        kept = pair + kept
+        used += cost
+    return head + kept + last
+
+
+# --- AI 코치 세션 상태 ---
+class CoachState:
+    """AI 전략 코치 메뉴 하나의 세션 상태입니다.
+
+    세션마다 하나씩 생기므로 __slots__로 인스턴스 딕셔너리를 없애고, 메뉴를
+    실제로 쓰기 전에는 만들지 않습니다. 전략/추천 목록은 공유 캐시나 색인의
+    객체를 복사하지 않고 튜플로 참조만 합니다.
+    """
+
+    __slots__ = (
+        "situation",
+        "strategies",
+        "local_matches",
+        "notice",
+        "chat",
+        "pending",
+    )
+
+    def __init__(self, situation=None):
+        self.situation = situation
+        self.strategies = ()
+        self.local_matches = ()
+        self.notice = None
+        # chat 모드의 대화 기록((역할, 텍스트) 튜플)과 응답을 기다리는
+        # (새 상황 또는 None, 보낸 메시지 또는 None)
+        self.chat = ()
+        self.pending = None
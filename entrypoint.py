@@ -0,0 +1,83 @@
+"""컨테이너 시작 스크립트: 미리 데워 둔 뒤 Streamlit 서버를 띄웁니다.
+
+1. 무거운 모듈(Streamlit, NumPy, Gemini SDK 등)을 미리 import합니다.
+2. WARMUP_RENDER가 켜져 있으면 같은 프로세스에서 모든 메뉴를 한 번씩 그려
+   st.cache_resource 자원(응답 캐시, 저장소, 명예의 전당, 정적 자산)을
+   채워 둡니다. 워밍업 중에는 앱이 LLM 클라이언트를 만들고 추천 색인이 다
+   만들어질 때까지 기다리므로, 첫 AI 요청도 준비 비용을 치르지 않습니다.
+   실제 서버도 같은 프로세스라 이 캐시를 그대로 씁니다.
+3. 준비 표시 파일(READY_FILE)을 쓰고 서버를 시작합니다. healthcheck.py는 이
+   파일과 서버 응답이 모두 있어야 준비된 것으로 봅니다.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import startup_timing
+
+logger = logging.getLogger("entrypoint")
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+READY_FILE = Path(os.getenv("READY_FILE", "/tmp/strategymaker.ready"))
+WARMUP_RENDER = os.getenv("WARMUP_RENDER", "1") not in ("0", "false", "")
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "60"))
+
+
+def preload_modules():
+    """첫 요청에서 치를 import 비용을 시작 단계로 옮깁니다."""
+    import llm
+
+    modules = ["streamlit", "numpy", "static_assets", "recommender", "hall_of_fame"]
+    backend = os.getenv("LLM_BACKEND", "gemini")
+    if backend == "gemini" and llm.is_configured(backend):
+        modules.append("google.generativeai")
+    for name in modules:
+        with startup_timing.timed(f"import:{name}"):
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logger.warning("미리 import하지 못했습니다 (%s): %s", name, e)
+
+
+def warmup_render():
+    """모든 메뉴를 한 번씩 그려 공용 자원 캐시를 채웁니다. 실패해도 서버는 뜹니다."""
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        with startup_timing.timed("warmup_render"), startup_timing.warmup():
+            at = AppTest.from_file(str(APP_PATH), default_timeout=WARMUP_TIMEOUT)
+            at.run()
+            for key in ("button_1", "button_2", "button_0"):
+                at.button(key=key).click().run()
+        if at.exception:
+            logger.warning("워밍업 렌더링 중 예외: %s", at.exception[0].value)
+    except Exception:
+        logger.exception("워밍업 렌더링에 실패했습니다.")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    READY_FILE.unlink(missing_ok=True)
+    started = time.perf_counter()
+    preload_modules()
+    if WARMUP_RENDER:
+        warmup_render()
+    logger.info(
+        "워밍업 완료: %.1f ms %s",
+        (time.perf_counter() - started) * 1000,
+        startup_timing.report()["phases"],
+    )
+    READY_FILE.write_text(str(os.getpid()))
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", str(APP_PATH), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+# --- 동시 요청 분산(fan-out) 실행 ---
+def fan_out(executor, calls, timeout, hedge_after=None, before_submit=None):
+    """여러 호출을 동시에 실행하고 끝나는 순서대로 (key, 결과, 오류)를 내보냅니다.
+
+    calls는 {key: 인자 없는 함수} 형태입니다. hedge_after(초)가 주어지면
+    그 시간 안에 끝나지 않았거나 실패한 호출을 한 번 더 보내고, 먼저 성공한
+    쪽의 결과를 씁니다. timeout(초)이 지나도록 끝나지 않은 호출은
+    TimeoutError로 보고됩니다.
+
+    before_submit은 호출(재전송 포함)을 스레드 풀에 넣기 직전에 불립니다.
+    속도 제한 토큰을 여기서 받으면 토큰 대기가 풀 스레드를 잡아 두지 않고
+    timeout에도 들어가지 않습니다. 재전송 전에 예외를 던지면 재전송은 건너뜁니다.
+    """
+    owner = {}
+    pending = set()
+    finished = set()
+    hedged = set()
+
+    def submit(key):
+        if before_submit is not None:
+            before_submit()
+        future = executor.submit(calls[key])
+        owner[future] = key
+        pending.add(future)
+
+    def hedge(key):
+        """한 번 더 보내고, 보내지 못했으면 False를 돌려줍니다."""
+        hedged.add(key)
+        try:
+            submit(key)
+        except Exception:
+            return False
+        return True
+
+    try:
+        for key in calls:
+            submit(key)
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    start = time.monotonic()
+    deadline = start + timeout
+    hedge_at = start + hedge_after if hedge_after is not None else None
+
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        wait_for = deadline - now
+        if hedge_at is not None and now < hedge_at:
+            wait_for = min(wait_for, hedge_at - now)
+        done, still_pending = wait(
+            pending, timeout=wait_for, return_when=FIRST_COMPLETED
+        )
+        pending.clear()
+        pending.update(still_pending)
+
+        # 원래 호출과 재전송이 같이 끝났으면 성공을 먼저 봐야 실패가 결과를 가리지 않습니다.
+        for future in sorted(done, key=lambda future: future.exception() is not None):
+            key = owner[future]
+            if key in finished:
+                continue
+            error = future.exception()
+            if error is None:
+                finished.add(key)
+                yield key, future.result(), None
+            elif hedge_at is not None and key not in hedged and hedge(key):
+                continue
+            elif not any(owner[other] == key for other in pending):
+                finished.add(key)
+                yield key, None, error
+
+        pending.difference_update(
+            [future for future in pending if owner[future] in finished]
+        )
+        if hedge_at is not None and time.monotonic() >= hedge_at:
+            for key in {owner[future] for future in pending} - hedged:
+                hedge(key)
+
+    for future in pending:
+        future.cancel()
+    for key in calls:
+        if key not in finished:
+            yield key, None, TimeoutError(f"{timeout}초 안에 응답을 받지 못했습니다.")
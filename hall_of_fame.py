@@ -0,0 +1,97 @@
+import csv
+import functools
+import json
+import unicodedata
+from pathlib import Path
+
+ALL_SPORTS = "모두 보기"
+SEARCH_FIELDS = ("선수", "전략")
+
+
+# --- 검색용 정규화 ---
+def normalize_text(text):
+    """검색 비교를 위해 유니코드 표기와 대소문자를 맞춥니다."""
+    return unicodedata.normalize("NFC", str(text)).casefold()
+
+
+def _bigrams(text):
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+# --- 데이터 파일 읽기 ---
+def read_records(path):
+    """CSV/JSON/Parquet 파일에서 선수/종목/전략 레코드 목록을 읽습니다."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if suffix == ".parquet":
+        import pandas as pd
+
+        return pd.read_parquet(path).to_dict("records")
+    raise ValueError(f"지원하지 않는 명예의 전당 데이터 형식입니다: {path}")
+
+
+# --- 명예의 전당 색인 ---
+class HallOfFame:
+    """명예의 전당 레코드와 종목별 색인, 글자 n-gram 검색 색인을 담습니다.
+
+    한 번 만들어 프로세스 전체가 읽기 전용으로 공유합니다. 검색은 한 글자면
+    글자 색인, 두 글자 이상이면 2-gram 색인의 교집합으로 후보를 좁힌 뒤 실제
+    부분 문자열 포함 여부를 확인하므로 한글 검색에도 그대로 동작합니다.
+    """
+
+    def __init__(self, records):
+        self.records = [
+            {"선수": r["선수"], "종목": r["종목"], "전략": r["전략"]} for r in records
+        ]
+        self._search_text = []
+        self._by_sport = {}
+        self._char_index = {}
+        self._bigram_index = {}
+        for i, record in enumerate(self.records):
+            self._by_sport.setdefault(record["종목"], []).append(i)
+            text = normalize_text(" ".join(record[f] for f in SEARCH_FIELDS))
+            self._search_text.append(text)
+            for char in set(text):
+                self._char_index.setdefault(char, []).append(i)
+            for gram in _bigrams(text):
+                self._bigram_index.setdefault(gram, []).append(i)
+        self.sports = [ALL_SPORTS] + sorted(self._by_sport)
+        # 페이지를 넘길 때마다 같은 검색을 반복하지 않도록 최근 결과를 보관합니다.
+        self._cached_search = functools.lru_cache(maxsize=256)(self._search)
+
+    def search(self, query="", sport=ALL_SPORTS):
+        """종목과 검색어에 맞는 레코드 번호를 원래 순서대로 돌려줍니다."""
+        return self._cached_search(normalize_text(query).strip(), sport)
+
+    def _search(self, query, sport):
+        if sport == ALL_SPORTS:
+            scope = None
+        else:
+            scope = self._by_sport.get(sport, [])
+        if not query:
+            return range(len(self.records)) if scope is None else tuple(scope)
+
+        if len(query) == 1:
+            postings = [self._char_index.get(query, [])]
+        else:
+            postings = [self._bigram_index.get(g, []) for g in _bigrams(query)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        if scope is not None:
+            candidates.intersection_update(scope)
+        return tuple(i for i in sorted(candidates) if query in self._search_text[i])
+
+    def page(self, indices, page, page_size):
+        """검색 결과 중 한 페이지 분량의 레코드만 꺼냅니다."""
+        start = page * page_size
+        return [self.records[i] for i in indices[start : start + page_size]]
@@ -0,0 +1,33 @@
+"""컨테이너 준비 상태 확인: 워밍업이 끝났고 서버가 응답하면 0으로 끝납니다.
+
+slim 이미지에는 curl이 없어서 표준 라이브러리만 씁니다.
+"""
+
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+READY_FILE = Path(os.getenv("READY_FILE", "/tmp/strategymaker.ready"))
+PORT = os.getenv("STREAMLIT_SERVER_PORT", "8501")
+BASE_URL_PATH = os.getenv("STREAMLIT_SERVER_BASE_URL_PATH", "").strip("/")
+
+
+def main():
+    if not READY_FILE.exists():
+        print("워밍업이 아직 끝나지 않았습니다.")
+        return 1
+    prefix = f"/{BASE_URL_PATH}" if BASE_URL_PATH else ""
+    url = f"http://127.0.0.1:{PORT}{prefix}/_stcore/health"
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            if response.status == 200:
+                return 0
+            print(f"서버 응답 코드: {response.status}")
+    except OSError as e:
+        print(f"서버에 연결하지 못했습니다: {e}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """작업이 취소되었거나 마감 시간을 넘겨 더 진행하지 않아야 할 때 발생합니다."""
+
+
+# --- 백그라운드 작업 ---
+class Job:
+    """세션 하나가 요청한 AI 생성 작업의 상태와 중간 결과를 담습니다."""
+
+    def __init__(self, key, deadline_seconds):
+        self.key = key
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + deadline_seconds
+        self.status = "running"
+        self.partial = []
+        self.result = None
+        self.error = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def running(self):
+        if self.status == "running" and time.monotonic() > self.deadline:
+            self._finish("timeout")
+        return self.status == "running"
+
+    def check(self):
+        """취소/마감 여부를 확인하고, 더 진행하면 안 되면 JobCancelled를 던집니다."""
+        if self._cancel.is_set():
+            raise JobCancelled("작업이 취소되었습니다.")
+        if time.monotonic() > self.deadline:
+            raise JobCancelled("작업 마감 시간을 넘겼습니다.")
+
+    def publish(self, strategies):
+        """지금까지 완성된 전략을 화면에서 읽을 수 있도록 공개합니다.
+
+        작업 함수는 여러 세션이 함께 기다리는 공유 호출(SingleFlight) 안에서
+        불릴 수 있으므로, 이 작업이 취소되었거나 마감을 넘겨도 예외를 던지지
+        않고 공개만 멈춥니다. 예외를 던지면 같은 호출을 기다리던 다른 세션까지
+        함께 실패합니다.
+        """
+        if self._cancel.is_set() or time.monotonic() > self.deadline:
+            return
+        self.partial = list(strategies)
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == "running":
+            self._finish("cancelled")
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.monotonic()
+
+
+# --- 프로세스 공용 작업 실행기 ---
+class JobRunner:
+    """세션 키별로 작업을 하나씩만 실행하는 백그라운드 실행기입니다.
+
+    작업 함수는 Job을 인자로 받아 중간 결과를 job.publish()로 알리고,
+    다른 세션과 공유하지 않는 단계에서는 job.check()로 취소/마감 여부를
+    확인합니다.
+    """
+
+    def __init__(self, max_workers=8, retention_seconds=600):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ai-job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, deadline_seconds):
+        """작업을 시작하고 (job, 새로 시작했는지)를 돌려줍니다.
+
+        같은 세션의 작업이 이미 진행 중이면 새로 시작하지 않고 기존 작업을 돌려줍니다.
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and job.running:
+                return job, False
+            job = Job(key, deadline_seconds)
+            self._jobs[key] = job
+        self._executor.submit(self._run, job, fn)
+        return job, True
+
+    def _run(self, job, fn):
+        try:
+            job.check()
+            result = fn(job)
+        except JobCancelled:
+            if job.status == "running":
+                job._finish("timeout")
+        except Exception as e:
+            if job.status == "running":
+                job._finish("failed", error=e)
+        else:
+            if job.status == "running":
+                job._finish("done", result=result)
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def pop(self, key):
+        with self._lock:
+            return self._jobs.pop(key, None)
+
+    def cancel(self, key):
+        job = self.get(key)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def active_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.running)
+
+    def _prune(self):
+        # 결과를 가져가지 않고 떠난 세션의 작업을 정리합니다.
+        now = time.monotonic()
+        for key, job in list(self._jobs.items()):
+            if (
+                not job.running
+                and job.finished_at is not None
+                and now - job.finished_at > self.retention_seconds
+            ):
+                del self._jobs[key]
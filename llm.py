@@ -0,0 +1,164 @@
+import os
+import random
+import time
+
+
+class FakeBackendError(RuntimeError):
+    """가짜 백엔드가 설정된 오류율에 따라 일부러 발생시키는 오류입니다."""
+
+
+# --- Gemini 백엔드 ---
+def _chunk_text(chunk):
+    try:
+        return chunk.text or ""
+    except ValueError:
+        # 안전 필터 등으로 텍스트가 없는 청크
+        return ""
+
+
+class GeminiBackend:
+    """google.generativeai를 감싼 기본 LLM 백엔드입니다.
+
+    grpc/protobuf까지 끌어오는 SDK import는 비용이 커서, 실제로 백엔드를
+    만들 때 처음 import합니다.
+    """
+
+    name = "gemini"
+
+    def __init__(self, model_name, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._genai = genai
+        self._model = genai.GenerativeModel(model_name)
+        # 시스템 지시문별 모델 (여러 턴 코칭용)
+        self._chat_models = {}
+
+    def generate(self, prompt, timeout=None):
+        """전체 응답 텍스트를 한 번에 돌려줍니다."""
+        request_options = {"timeout": timeout} if timeout else None
+        response = self._model.generate_content(prompt, request_options=request_options)
+        return getattr(response, "text", None) or ""
+
+    def stream(self, prompt, timeout=None):
+        """응답 텍스트를 도착하는 대로 조각씩 내보냅니다."""
+        request_options = {"timeout": timeout} if timeout else None
+        for chunk in self._model.generate_content(
+            prompt, stream=True, request_options=request_options
+        ):
+            yield _chunk_text(chunk)
+
+    def chat_stream(self, system_instruction, history, message, timeout=None):
+        """이전 대화에 이어 message를 보내고 응답을 조각씩 내보냅니다.
+
+        긴 지시문은 매번 프롬프트에 붙이지 않고 모델의 system_instruction으로
+        넘깁니다. history는 (역할, 텍스트) 튜플 목록이며 역할은 "user"/"model"입니다.
+        """
+        model = self._chat_models.get(system_instruction)
+        if model is None:
+            model = self._genai.GenerativeModel(
+                self.model_name, system_instruction=system_instruction
+            )
+            self._chat_models[system_instruction] = model
+        chat = model.start_chat(
+            history=[{"role": role, "parts": [text]} for role, text in history]
+        )
+        request_options = {"timeout": timeout} if timeout else None
+        for chunk in chat.send_message(
+            message, stream=True, request_options=request_options
+        ):
+            yield _chunk_text(chunk)
+
+
+# --- 부하 테스트용 가짜 백엔드 ---
+class FakeBackend:
+    """네트워크 없이 Gemini 응답을 흉내 내는 로컬 백엔드입니다.
+
+    latency(초)만큼 기다린 뒤 응답하고, 스트리밍일 때는 chunk_size글자씩
+    chunk_delay(초) 간격으로 내보냅니다. error_rate 비율만큼 FakeBackendError가
+    발생합니다.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        model_name="fake",
+        latency=0.8,
+        jitter=0.2,
+        chunk_size=24,
+        chunk_delay=0.05,
+        error_rate=0.0,
+        seed=None,
+    ):
+        self.model_name = model_name
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def _wait_and_maybe_fail(self, timeout):
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"{timeout}초 안에 응답을 받지 못했습니다.")
+        time.sleep(delay)
+        if self._random.random() < self.error_rate:
+            raise FakeBackendError("가짜 백엔드 오류 (부하 테스트용)")
+
+    @staticmethod
+    def _answer(prompt):
+        count = 1 if "Generate ONE" in prompt else 3
+        blocks = [
+            f"[전략]: 가짜 전략 {i + 1}\n"
+            f"[해설]: 부하 테스트용 응답입니다. 실제 코칭 내용이 아닙니다. "
+            f"요청 길이는 {len(prompt)}자였습니다."
+            for i in range(count)
+        ]
+        return "\n---\n".join(blocks)
+
+    def generate(self, prompt, timeout=None):
+        self._wait_and_maybe_fail(timeout)
+        return self._answer(prompt)
+
+    def stream(self, prompt, timeout=None):
+        self._wait_and_maybe_fail(timeout)
+        text = self._answer(prompt)
+        for start in range(0, len(text), self.chunk_size):
+            if start:
+                time.sleep(self.chunk_delay)
+            yield text[start : start + self.chunk_size]
+
+    def chat_stream(self, system_instruction, history, message, timeout=None):
+        """실제로 보내질 지시문/대화 기록/메시지를 합친 길이가 응답에 드러납니다."""
+        sent = system_instruction + "".join(text for _, text in history) + message
+        yield from self.stream(sent, timeout=timeout)
+
+
+# --- 백엔드 선택 ---
+def is_configured(backend_name):
+    """SDK를 import하지 않고 백엔드를 쓸 준비가 되었는지(API 키 등) 확인합니다."""
+    if backend_name == "gemini":
+        return bool(os.getenv("GEMINI_API_KEY"))
+    return True
+
+
+def make_backend(backend_name, model_name):
+    """이름에 맞는 LLM 백엔드를 만듭니다. 가짜 백엔드는 FAKE_LLM_* 환경 변수로 조절합니다."""
+    if backend_name == "gemini":
+        return GeminiBackend(model_name, api_key=os.getenv("GEMINI_API_KEY"))
+    if backend_name == "fake":
+        seed = os.getenv("FAKE_LLM_SEED")
+        return FakeBackend(
+            model_name,
+            latency=float(os.getenv("FAKE_LLM_LATENCY", "0.8")),
+            jitter=float(os.getenv("FAKE_LLM_JITTER", "0.2")),
+            chunk_size=int(os.getenv("FAKE_LLM_CHUNK_SIZE", "24")),
+            chunk_delay=float(os.getenv("FAKE_LLM_CHUNK_DELAY", "0.05")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+    raise ValueError(f"알 수 없는 LLM 백엔드입니다: {backend_name}")
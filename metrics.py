@@ -0,0 +1,319 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels
+    )
+    return "{" + pairs + "}"
+
+
+# --- 지표 종류 ---
+class Counter:
+    """계속 늘어나기만 하는 값(호출 수, 실패 수 등)입니다."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """현재 상태를 나타내는 값(활성 세션 수 등)입니다."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """지연 시간/크기처럼 분포를 봐야 하는 값을 구간별로 셉니다."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                for bound, value in zip(self.buckets, counts):
+                    result.append(
+                        (f"{self.name}_bucket", key + (("le", bound),), value)
+                    )
+                result.append((f"{self.name}_bucket", key + (("le", "+Inf"),), count))
+                result.append((f"{self.name}_sum", key, total))
+                result.append((f"{self.name}_count", key, count))
+        return result
+
+
+# --- 지표 저장소 ---
+class Registry:
+    """프로세스 전체의 지표를 모아 Prometheus 텍스트 형식으로 내보냅니다."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, fn):
+        """내보내기 직전에 호출되어 게이지 값을 갱신하는 함수를 등록합니다."""
+        with self._lock:
+            self._collectors.append(fn)
+
+    def render(self):
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for fn in collectors:
+            try:
+                fn()
+            except Exception:
+                # 수집 실패가 지표 전체를 막지 않도록 무시합니다.
+                pass
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+SPAN_SECONDS = REGISTRY.histogram(
+    "strategymaker_span_seconds", "Duration of instrumented code spans."
+)
+ACTIVE_SESSIONS = REGISTRY.gauge(
+    "strategymaker_active_sessions", "Sessions that reran within the activity window."
+)
+
+
+@contextmanager
+def span(name, **labels):
+    """코드 구간의 소요 시간을 strategymaker_span_seconds에 기록합니다."""
+    with SPAN_SECONDS.time(span=name, **labels):
+        yield
+
+
+# --- 활성 세션 추적 ---
+class SessionTracker:
+    """최근 window초 안에 화면을 다시 그린 세션 수를 셉니다."""
+
+    def __init__(self, window_seconds=300):
+        self.window_seconds = window_seconds
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_key):
+        with self._lock:
+            self._seen[session_key] = time.monotonic()
+
+    def active(self):
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            for key in [k for k, seen in self._seen.items() if seen < cutoff]:
+                del self._seen[key]
+            return len(self._seen)
+
+
+SESSIONS = SessionTracker()
+REGISTRY.add_collector(lambda: ACTIVE_SESSIONS.set(SESSIONS.active()))
+
+
+# --- 내보내기: HTTP 엔드포인트 / 파일 ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port, address="0.0.0.0"):
+    """/metrics 를 제공하는 HTTP 서버를 데몬 스레드로 띄웁니다."""
+    server = ThreadingHTTPServer((address, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+class FileExporter:
+    """사이드카가 읽을 수 있도록 지표를 데몬 스레드에서 주기적으로 파일에 씁니다.
+
+    화면을 다시 그리는 세션이 없어도 활성 세션/작업 수 같은 값이 갱신됩니다.
+    """
+
+    def __init__(self, path, interval_seconds=15):
+        self.path = str(path)
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="metrics-file", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("지표 파일을 쓰지 못했습니다: %s", e)
+            if self._stopped.wait(self.interval_seconds):
+                return
+
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(REGISTRY.render())
+        os.replace(tmp_path, self.path)
+
+
+# --- 느린 재실행 프로파일링 ---
+# 전체 재실행 안에서 fragment가 다시 프로파일러를 켜지 않도록 스레드별로 표시합니다.
+_profiling = threading.local()
+
+
+class RerunProfiler:
+    """한 번의 스크립트 실행을 프로파일링하고, 느렸을 때만 결과를 파일로 남깁니다.
+
+    engine이 "pyinstrument"이고 pyinstrument가 설치되어 있으면 HTML 보고서를,
+    아니면 cProfile의 .prof 파일을 씁니다. 같은 스레드에서 이미 프로파일링
+    중이면 start()가 ValueError를 던집니다.
+    """
+
+    def __init__(self, directory, slow_ms, engine="cprofile"):
+        self.directory = directory
+        self.slow_ms = slow_ms
+        self._pyinstrument = None
+        self._cprofile = None
+        if engine == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                pass
+            else:
+                self._pyinstrument = Profiler()
+        if self._pyinstrument is None:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+        self._start = None
+
+    def start(self):
+        if getattr(_profiling, "active", False):
+            raise ValueError("이 스레드는 이미 프로파일링 중입니다.")
+        self._start = time.perf_counter()
+        if self._pyinstrument is not None:
+            self._pyinstrument.start()
+        else:
+            self._cprofile.enable()
+        _profiling.active = True
+
+    def stop(self, label):
+        """프로파일링을 멈추고 느렸으면 저장한 파일 경로를, 아니면 None을 돌려줍니다."""
+        if self._pyinstrument is not None:
+            self._pyinstrument.stop()
+        else:
+            self._cprofile.disable()
+        _profiling.active = False
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if elapsed_ms < self.slow_ms:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(
+            self.directory, f"rerun-{stamp}-{label}-{int(elapsed_ms)}ms"
+        )
+        if self._pyinstrument is not None:
+            path = f"{base}.html"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._pyinstrument.output_html())
+        else:
+            path = f"{base}.prof"
+            self._cprofile.dump_stats(path)
+        return path
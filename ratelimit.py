@@ -0,0 +1,124 @@
+import threading
+import time
+
+
+class RateLimitBusy(Exception):
+    """대기열이 가득 찼거나 정해진 시간 안에 호출 차례가 오지 않을 때 발생합니다."""
+
+
+# --- 토큰 버킷 속도 제한 ---
+class TokenBucket:
+    """프로세스 전체에서 공유하는 토큰 버킷 속도 제한기입니다.
+
+    초당 rate개씩 토큰이 채워지고 최대 burst개까지 쌓입니다. 토큰을 기다리는
+    호출은 max_waiters개까지만 허용하고, 그 이상은 바로 RateLimitBusy로
+    거절해 요청이 무한정 쌓이지 않도록 합니다.
+    """
+
+    def __init__(self, rate, burst, max_waiters=32):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_waiters = max_waiters
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = 0
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=10.0):
+        """토큰 하나를 얻을 때까지 최대 timeout초 기다립니다."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            if self._waiters >= self.max_waiters:
+                raise RateLimitBusy("대기 중인 요청이 너무 많습니다.")
+            self._waiters += 1
+            try:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RateLimitBusy(
+                            "호출 차례를 기다리다 시간이 초과되었습니다."
+                        )
+                    self._cond.wait(min(remaining, (1 - self._tokens) / self.rate))
+            finally:
+                self._waiters -= 1
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {"tokens": self._tokens, "waiters": self._waiters}
+
+
+# --- 동일 요청 합치기 (single-flight) ---
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐 결과를 나눠 갖게 합니다."""
+
+    def __init__(self, check_interval=0.2):
+        self.check_interval = check_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout=None, check=None):
+        """(결과, 다른 호출의 결과를 공유했는지)를 돌려줍니다.
+
+        check가 주어지면 다른 호출을 기다리는 동안 check_interval초마다 불러,
+        check가 예외를 던지면 그 호출자만 기다리기를 그만둡니다. 공유 호출은
+        다른 호출자를 위해 계속 진행됩니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            end = None if timeout is None else time.monotonic() + timeout
+            while True:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        "함께 기다리던 요청이 제시간에 끝나지 않았습니다."
+                    )
+                if check is not None:
+                    check()
+                    if remaining is None or remaining > self.check_interval:
+                        remaining = self.check_interval
+                if call.done.wait(remaining):
+                    break
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
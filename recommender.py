@@ -0,0 +1,146 @@
+import math
+import threading
+import unicodedata
+
+import numpy as np
+
+
+# --- 글자 n-gram 추출 ---
+def char_ngrams(text, sizes=(2, 3)):
+    """공백을 하나로 줄인 텍스트에서 글자 n-gram 빈도를 셉니다.
+
+    형태소 분석 없이도 한국어 어미/조사 변화에 강하도록 글자 단위로 자릅니다.
+    """
+    text = " ".join(unicodedata.normalize("NFC", text or "").casefold().split())
+    counts = {}
+    for size in sizes:
+        for i in range(len(text) - size + 1):
+            gram = text[i : i + size]
+            if gram.strip():
+                counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+# --- 로컬 전략 추천 색인 ---
+class StrategyIndex:
+    """이미 가진 전략들을 BM25로 검색하는 메모리 색인입니다.
+
+    단어(글자 n-gram)별로 문서 번호/빈도 목록을 쌓아 두고, 질의할 때 NumPy로
+    점수를 한꺼번에 더합니다. 문서는 언제든 추가/삭제할 수 있고 idf는 질의
+    시점에 계산하므로 다시 색인할 필요가 없습니다. owner가 있는 문서는 같은
+    owner의 질의에서만 보입니다.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._terms = {}
+        self._postings = []
+        self._docs = []
+        self._keys = {}
+        self._owner_codes = {None: 0}
+        # 문서별 배열은 용량을 두 배씩 늘려 추가가 평균 O(1)이 되도록 합니다.
+        self._lengths = np.zeros(64, dtype=np.float64)
+        self._alive = np.zeros(64, dtype=bool)
+        self._owners = np.zeros(64, dtype=np.int64)
+        self._total_length = 0.0
+        self._alive_count = 0
+
+    def __len__(self):
+        return self._alive_count
+
+    def _grow(self):
+        size = len(self._lengths) * 2
+        for name in ("_lengths", "_alive", "_owners"):
+            old = getattr(self, name)
+            new = np.zeros(size, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, key, text, document, owner=None):
+        """key로 구분되는 문서를 추가합니다. 이미 있는 key면 무시합니다."""
+        grams = char_ngrams(text)
+        if not grams:
+            return False
+        with self._lock:
+            if key in self._keys:
+                return False
+            doc_id = len(self._docs)
+            if doc_id == len(self._lengths):
+                self._grow()
+            self._keys[key] = doc_id
+            self._docs.append(document)
+            owner_code = self._owner_codes.setdefault(owner, len(self._owner_codes))
+            length = float(sum(grams.values()))
+            self._lengths[doc_id] = length
+            self._alive[doc_id] = True
+            self._owners[doc_id] = owner_code
+            self._total_length += length
+            self._alive_count += 1
+            for gram, tf in grams.items():
+                term_id = self._terms.get(gram)
+                if term_id is None:
+                    term_id = self._terms[gram] = len(self._postings)
+                    self._postings.append(([], []))
+                ids, tfs = self._postings[term_id]
+                ids.append(doc_id)
+                tfs.append(tf)
+        return True
+
+    def remove(self, key):
+        with self._lock:
+            doc_id = self._keys.pop(key, None)
+            if doc_id is None or not self._alive[doc_id]:
+                return False
+            self._alive[doc_id] = False
+            self._total_length -= self._lengths[doc_id]
+            self._alive_count -= 1
+        return True
+
+    def search(self, query, owner=None, k=3, min_score=0.0):
+        """질의와 가장 비슷한 문서를 (점수, 문서) 목록으로 돌려줍니다.
+
+        점수는 질의의 모든 n-gram이 들어 있는 문서를 1로 보는 0~1 사이 값입니다.
+        """
+        grams = char_ngrams(query)
+        with self._lock:
+            size = len(self._docs)
+            if not grams or not self._alive_count:
+                return []
+            lengths = self._lengths[:size]
+            alive = self._alive[:size]
+            avg_length = self._total_length / self._alive_count
+            norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+            scores = np.zeros(size, dtype=np.float64)
+            best = 0.0
+            for gram in grams:
+                term_id = self._terms.get(gram)
+                if term_id is None:
+                    ids = None
+                    df = 0
+                else:
+                    ids, tfs = self._postings[term_id]
+                    ids = np.asarray(ids)
+                    tfs = np.asarray(tfs, dtype=np.float64)
+                    df = int(alive[ids].sum())
+                idf = math.log(1 + (self._alive_count - df + 0.5) / (df + 0.5))
+                # 색인에 없는 n-gram도 만점 기준에는 포함해 점수가 부풀지 않게 합니다.
+                best += idf * (self.k1 + 1)
+                if ids is not None:
+                    scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm[ids])
+            if not best:
+                return []
+            owners = self._owners[:size]
+            visible = alive & (
+                (owners == 0) | (owners == self._owner_codes.get(owner, -1))
+            )
+            scores = np.where(visible, scores / best, 0.0)
+            k = min(k, size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (float(scores[i]), self._docs[i])
+                for i in top
+                if scores[i] > 0 and scores[i] >= min_score
+            ]
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# 적중할 때마다 쓰기를 하지 않도록, 이보다 오래전에 읽힌 항목만 LRU 시각을 갱신합니다.
+TOUCH_INTERVAL_SECONDS = 60
+
+
+# --- 프롬프트 정규화 함수 ---
+def normalize_prompt(text):
+    """공백/유니코드 표기 차이를 없애 같은 질문이 같은 키를 갖도록 합니다."""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.split()).casefold()
+
+
+# --- 디스크 기반 응답 캐시 ---
+class ResponseCache:
+    """파싱된 AI 전략 목록을 SQLite에 저장하는 TTL + LRU 캐시입니다.
+
+    한 호스트의 여러 프로세스(레플리카)가 같은 파일을 쓸 수 있도록 WAL 모드로
+    열고, 연결은 스레드마다 따로 만듭니다. WAL은 공유 메모리를 쓰므로 여러
+    호스트나 네트워크 파일시스템(NFS 등)에서는 파일을 공유할 수 없습니다.
+
+    캐시는 성능을 위한 것이므로 SQLite 오류(잠금 등)가 나면 경고만 남기고
+    조회는 미적중으로, 저장은 건너뛴 것으로 처리합니다.
+    """
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=5000):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "expired", "evictions", "errors"), 0
+        )
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                label TEXT
+            )
+            """
+        )
+        columns = [
+            row[1] for row in conn.execute("PRAGMA table_info(response_cache)")
+        ]
+        if "label" not in columns:
+            # label 열이 생기기 전에 만들어진 캐시 파일
+            conn.execute("ALTER TABLE response_cache ADD COLUMN label TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed "
+            "ON response_cache (accessed_at)"
+        )
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        raw = f"{model_name}\x00{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _failed(self, action, error):
+        self._count("errors")
+        try:
+            self._connect().rollback()
+        except sqlite3.Error:
+            pass
+        logger.warning("응답 캐시 %s 실패: %s", action, error)
+
+    def get(self, model_name, prompt):
+        """저장된 전략 목록을 돌려주고, 없거나 만료됐으면 None을 돌려줍니다."""
+        key = self.make_key(model_name, prompt)
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, created_at, accessed_at FROM response_cache "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("조회", e)
+            self._count("misses")
+            return None
+        now = time.time()
+        if row is None:
+            self._count("misses")
+            return None
+        value, created_at, accessed_at = row
+        try:
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._count("expired")
+                self._count("misses")
+                return None
+            if now - accessed_at > TOUCH_INTERVAL_SECONDS:
+                conn.execute(
+                    "UPDATE response_cache SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            # 만료 정리나 LRU 시각 갱신을 못 해도 읽은 값은 그대로 씁니다.
+            self._failed("갱신", e)
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._count("misses")
+                return None
+        self._count("hits")
+        return json.loads(value)
+
+    def set(self, model_name, prompt, strategies, label=None):
+        """파싱된 전략 목록을 저장하고 용량을 넘으면 오래된 항목부터 지웁니다.
+
+        label에는 사람이 읽을 수 있는 원래 질문(상황)을 함께 남길 수 있습니다.
+        """
+        key = self.make_key(model_name, prompt)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, model, value, created_at, accessed_at, label) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    model_name,
+                    json.dumps(strategies, ensure_ascii=False),
+                    now,
+                    now,
+                    label,
+                ),
+            )
+            (size,) = conn.execute(
+                "SELECT COUNT(*) FROM response_cache"
+            ).fetchone()
+            excess = size - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM response_cache WHERE key IN ("
+                    "SELECT key FROM response_cache "
+                    "ORDER BY accessed_at ASC LIMIT ?)",
+                    (excess,),
+                )
+            conn.commit()
+        except sqlite3.Error as e:
+            self._failed("저장", e)
+            return
+        if excess > 0:
+            self._count("evictions", excess)
+
+    def entries(self, model_name):
+        """만료되지 않은 항목을 (label, 전략 목록)으로 하나씩 돌려줍니다."""
+        cutoff = time.time() - self.ttl_seconds if self.ttl_seconds else 0
+        try:
+            rows = self._connect().execute(
+                "SELECT label, value FROM response_cache "
+                "WHERE model = ? AND created_at >= ?",
+                (model_name, cutoff),
+            ).fetchall()
+        except sqlite3.Error as e:
+            self._failed("목록 조회", e)
+            return
+        for label, value in rows:
+            yield label, json.loads(value)
+
+    def stats(self):
+        """적중/미적중 카운터와 현재 항목 수를 돌려줍니다."""
+        try:
+            (size,) = self._connect().execute(
+                "SELECT COUNT(*) FROM response_cache"
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("통계 조회", e)
+            size = None
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["entries"] = size
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
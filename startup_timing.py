@@ -0,0 +1,58 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 이 모듈이 처음 import된 시점을 프로세스 시작 시점으로 봅니다.
+PROCESS_STARTED = time.perf_counter()
+
+_lock = threading.Lock()
+_phases = {}
+_first_render_ms = None
+_warming_up = False
+
+
+@contextmanager
+def timed(name):
+    """무거운 import/초기화 구간의 소요 시간을 기록합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _lock:
+            _phases[name] = round(elapsed, 2)
+        logger.info("시작 구간 '%s': %.1f ms", name, elapsed)
+
+
+@contextmanager
+def warmup():
+    """entrypoint.py의 워밍업 렌더링 구간을 표시합니다. 앱은 이 동안 공용 자원을 미리 만듭니다."""
+    global _warming_up
+    _warming_up = True
+    try:
+        yield
+    finally:
+        _warming_up = False
+
+
+def is_warming_up():
+    return _warming_up
+
+
+def record_first_render():
+    """프로세스에서 처음 끝난 화면 렌더링까지의 시간을 한 번만 기록합니다."""
+    global _first_render_ms
+    with _lock:
+        if _first_render_ms is not None:
+            return
+        _first_render_ms = round((time.perf_counter() - PROCESS_STARTED) * 1000, 2)
+    logger.info("첫 화면 렌더링 완료: 프로세스 시작 후 %.1f ms", _first_render_ms)
+
+
+def report():
+    """지금까지 기록된 시작 시간 보고서를 돌려줍니다."""
+    with _lock:
+        return {"first_render_ms": _first_render_ms, "phases": dict(_phases)}
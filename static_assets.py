@@ -0,0 +1,226 @@
+"""헤더 아이콘, 스타일시트, 한글 서브셋 폰트를 static/에 미리 만들어 두는 빌드 단계입니다.
+
+Docker 빌드에서 `python static_assets.py`로 한 번 실행하고, 앱은 만들어진
+manifest.json만 읽습니다. 파일 이름에 내용 해시를 넣어 내용이 바뀌면 URL도
+바뀌게 합니다.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SOURCE_ICON = ROOT / "icon.png"
+SOURCE_STYLESHEET = ROOT / "assets" / "styles.css"
+SOURCE_FONT_DIR = ROOT / "assets" / "fonts"
+# Streamlit 정적 파일 서빙(server.enableStaticServing)은 앱 옆의 static/만 제공합니다.
+STATIC_DIR = ROOT / "static"
+STATIC_URL = "app/static"
+MANIFEST_NAME = "manifest.json"
+
+# 화면에는 52x52로 보이므로 고해상도 화면을 위해 두 배 크기로 만듭니다.
+ICON_SIZE = 104
+FONT_FAMILY = "Noto Sans KR"
+# assets/fonts/에 원본 폰트가 없어 서브셋을 만들지 못했을 때 쓰는 원격 폰트입니다.
+FONT_FALLBACK_URL = "https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap"
+_HASHED_NAME = re.compile(r"^(icon|styles|font-\d+)\.[0-9a-f]{10}\.")
+
+
+def _hashed_name(stem, suffix, data):
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f"{stem}.{digest}{suffix}"
+
+
+def static_url(name):
+    """static/ 안의 파일을 가리키는 페이지 기준 상대 URL입니다."""
+    return f"{STATIC_URL}/{name}"
+
+
+def _write(out_dir, name, data):
+    path = out_dir / name
+    if not path.exists():
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return name
+
+
+# --- 아이콘 ---
+def build_icon(source, out_dir, size=ICON_SIZE):
+    """아이콘을 size 픽셀로 줄여 WebP와 PNG(대체용) 두 가지로 저장합니다."""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = image.convert("RGBA")
+        image.thumbnail((size, size), Image.LANCZOS)
+        variants = {}
+        for key, fmt, options in (
+            ("icon_webp", "WEBP", {"quality": 90, "method": 6}),
+            ("icon_png", "PNG", {"optimize": True}),
+        ):
+            buffer = io.BytesIO()
+            image.save(buffer, fmt, **options)
+            data = buffer.getvalue()
+            suffix = "." + fmt.lower()
+            variants[key] = _write(out_dir, _hashed_name("icon", suffix, data), data)
+    return variants
+
+
+# --- 스타일시트 ---
+def minify_css(css):
+    """주석을 지우고 공백을 줄입니다. 이 앱의 스타일시트 정도를 위한 단순한 압축입니다."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"([^\s(]):\s+", r"\1:", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def _font_face_rules(fonts):
+    rules = []
+    for weight, name in sorted(fonts.items()):
+        fmt = "woff2" if name.endswith(".woff2") else "woff"
+        rules.append(
+            "@font-face{"
+            f"font-family:'{FONT_FAMILY}';font-style:normal;font-weight:{weight};"
+            f"font-display:swap;src:local('{FONT_FAMILY}'),"
+            f"url({static_url(name)}) format('{fmt}')"
+            "}"
+        )
+    return "".join(rules)
+
+
+def build_stylesheet(source, out_dir, fonts):
+    """스타일시트를 압축하고 자체 호스팅 폰트의 @font-face를 앞에 붙입니다.
+
+    자체 호스팅 폰트가 없으면 대신 Google Fonts를 @import해 시스템 폰트로
+    떨어지지 않게 합니다.
+    """
+    if fonts:
+        head = _font_face_rules(fonts)
+    else:
+        head = f"@import url('{FONT_FALLBACK_URL}');"
+    css = head + minify_css(source.read_text(encoding="utf-8"))
+    data = css.encode("utf-8")
+    return _write(out_dir, _hashed_name("styles", ".min.css", data), data)
+
+
+# --- 한글 서브셋 폰트 ---
+def korean_charset(extra_sources=()):
+    """기본 라틴 문자, KS X 1001 한글 2,350자, 앱/데이터에 쓰인 글자를 모읍니다."""
+    chars = set(chr(c) for c in range(0x20, 0x7F))
+    chars.update("‘’“”…·•–—")
+    for lead in range(0xB0, 0xC9):
+        for trail in range(0xA1, 0xFF):
+            try:
+                chars.add(bytes((lead, trail)).decode("euc_kr"))
+            except UnicodeDecodeError:
+                continue
+    for path in extra_sources:
+        try:
+            chars.update(Path(path).read_text(encoding="utf-8"))
+        except (FileNotFoundError, UnicodeDecodeError):
+            continue
+    return "".join(sorted(c for c in chars if not c.isspace() or c == " "))
+
+
+def build_fonts(source_dir, out_dir, text):
+    """source_dir의 TTF/OTF를 text에 쓰인 글자만 남겨 WOFF2(없으면 WOFF)로 줄입니다.
+
+    fontTools가 없거나 원본 폰트가 없으면 아무것도 만들지 않고, 스타일시트는
+    Google Fonts를 불러옵니다. {굵기: 파일 이름}을 돌려줍니다.
+    """
+    sources = sorted(
+        p for p in Path(source_dir).glob("*") if p.suffix.lower() in (".ttf", ".otf")
+    )
+    if not sources:
+        return {}
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("fontTools가 없어 폰트 서브셋을 건너뜁니다.", file=sys.stderr)
+        return {}
+    try:
+        import brotli  # noqa: F401
+
+        flavor = "woff2"
+    except ImportError:
+        flavor = "woff"
+
+    fonts = {}
+    for source in sources:
+        font = TTFont(source)
+        weight = font["OS/2"].usWeightClass if "OS/2" in font else 400
+        options = subset.Options()
+        options.flavor = flavor
+        options.layout_features = ["*"]
+        options.name_IDs = ["*"]
+        options.hinting = False
+        options.desubroutinize = True
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+        buffer = io.BytesIO()
+        font.flavor = flavor
+        font.save(buffer)
+        data = buffer.getvalue()
+        fonts[weight] = _write(
+            out_dir, _hashed_name(f"font-{weight}", f".{flavor}", data), data
+        )
+    return fonts
+
+
+# --- 전체 빌드 ---
+def build(out_dir=STATIC_DIR):
+    """모든 자산을 만들고 manifest를 씁니다. 만든 manifest 내용을 돌려줍니다."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    if SOURCE_ICON.exists():
+        manifest.update(build_icon(SOURCE_ICON, out_dir))
+    text = korean_charset(
+        [ROOT / "app.py", *sorted((ROOT / "data").glob("hall_of_fame.*"))]
+    )
+    fonts = build_fonts(SOURCE_FONT_DIR, out_dir, text)
+    manifest["fonts"] = {str(weight): name for weight, name in fonts.items()}
+    manifest["stylesheet"] = build_stylesheet(SOURCE_STYLESHEET, out_dir, fonts)
+
+    current = set(manifest.get("fonts", {}).values())
+    current.update(v for v in manifest.values() if isinstance(v, str))
+    for path in out_dir.iterdir():
+        # 이전 빌드가 남긴 해시 파일을 정리합니다.
+        if _HASHED_NAME.match(path.name) and path.name not in current:
+            path.unlink()
+    data = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp_path = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out_dir / MANIFEST_NAME)
+    return manifest
+
+
+def load_manifest(out_dir=STATIC_DIR):
+    """manifest를 읽습니다. 없거나 원본보다 오래되었으면 다시 빌드합니다."""
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / MANIFEST_NAME
+    sources = [SOURCE_ICON, SOURCE_STYLESHEET, *Path(SOURCE_FONT_DIR).glob("*")]
+    newest = max((p.stat().st_mtime for p in sources if p.exists()), default=0)
+    try:
+        if manifest_path.stat().st_mtime >= newest:
+            return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        pass
+    return build(out_dir)
+
+
+if __name__ == "__main__":
+    result = build()
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    for path in sorted(STATIC_DIR.iterdir()):
+        print(f"  {path.name:40s} {path.stat().st_size:>8,d} bytes")
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+# --- 나의 큰틀전략 저장소 ---
+class StrategyStore:
+    """사용자별 큰틀전략을 SQLite(WAL)에 저장하는 영구 저장소입니다.
+
+    추가/삭제는 고정된 id 기준으로 행 하나만 다루고, 목록은 최신순으로
+    id 커서를 이용해 페이지 단위로 읽습니다. 연결은 스레드마다 따로 만들어
+    여러 세션에서 동시에 사용해도 안전합니다.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS strategies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                owner TEXT NOT NULL,
+                name TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_strategies_owner_id "
+            "ON strategies (owner, id)"
+        )
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, owner, name, strategy):
+        """전략 하나를 저장하고 새 id를 돌려줍니다."""
+        conn = self._connect()
+        cursor = conn.execute(
+            "INSERT INTO strategies (owner, name, strategy, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (owner, name, strategy, time.time()),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+    def delete(self, owner, strategy_id):
+        """본인 전략 하나를 지우고, 실제로 지웠는지를 돌려줍니다."""
+        conn = self._connect()
+        cursor = conn.execute(
+            "DELETE FROM strategies WHERE owner = ? AND id = ?", (owner, strategy_id)
+        )
+        conn.commit()
+        return cursor.rowcount > 0
+
+    def page(self, owner, limit=None, before_id=None):
+        """최신순으로 전략을 읽습니다. before_id를 주면 그보다 오래된 것부터 읽습니다."""
+        query = "SELECT id, name, strategy, created_at FROM strategies WHERE owner = ?"
+        params = [owner]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        return [dict(row) for row in self._connect().execute(query, params)]
+
+    def count(self, owner):
+        (total,) = (
+            self._connect()
+            .execute("SELECT COUNT(*) FROM strategies WHERE owner = ?", (owner,))
+            .fetchone()
+        )
+        return total
+
+    def iter_all(self):
+        """모든 사용자의 전략을 오래된 순서로 하나씩 돌려줍니다."""
+        yield from map(
+            dict,
+            self._connect().execute(
+                "SELECT id, owner, name, strategy FROM strategies ORDER BY id"
+            ),
+        )
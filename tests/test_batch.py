@@ -0,0 +1,36 @@
+import json
+
+from batch import read_done_ids, trim_partial_line
+
+
+def write_interrupted(path):
+    ok = json.dumps({"id": "1", "status": "ok"}, ensure_ascii=False) + "\n"
+    cut = json.dumps(
+        {"id": "2", "status": "ok", "situation": "긴장"}, ensure_ascii=False
+    )
+    # 마지막 기록이 한글 글자 중간에서 잘린 상황입니다.
+    path.write_bytes(ok.encode("utf-8") + cut.encode("utf-8")[:-3])
+
+
+def test_read_done_ids_skips_line_cut_inside_character(tmp_path):
+    path = tmp_path / "out.jsonl"
+    write_interrupted(path)
+    assert read_done_ids(path) == {"1"}
+
+
+def test_trim_partial_line_keeps_appended_records_separate(tmp_path):
+    path = tmp_path / "out.jsonl"
+    write_interrupted(path)
+    trim_partial_line(path, chunk_size=8)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "3", "status": "ok"}) + "\n")
+    assert read_done_ids(path) == {"1", "3"}
+
+
+def test_trim_partial_line_without_newline_or_file(tmp_path):
+    path = tmp_path / "out.jsonl"
+    trim_partial_line(path)
+    assert not path.exists()
+    path.write_bytes(b'{"id": "1"')
+    trim_partial_line(path)
+    assert path.read_bytes() == b""
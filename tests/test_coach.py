@@ -0,0 +1,66 @@
+from coach import (
+    StrategyStreamParser,
+    estimate_tokens,
+    format_strategies,
+    parse_strategies,
+    trim_history,
+)
+
+STRATEGIES = [
+    {"strategy": "호흡을 길게", "explanation": "내쉬는 숨을 두 배로 합니다."},
+    {"strategy": "루틴 지키기", "explanation": "늘 하던 순서대로 준비합니다."},
+    {"strategy": "다음 공", "explanation": "지난 실수는 잊고 다음에 집중합니다."},
+]
+
+
+def test_parse_strategies_round_trips_format():
+    assert parse_strategies(format_strategies(STRATEGIES)) == STRATEGIES
+    assert parse_strategies("형식이 다른 답") == []
+
+
+def test_stream_parser_one_character_at_a_time():
+    text = "머리말\n---\n" + format_strategies(STRATEGIES)
+    parser = StrategyStreamParser()
+    emitted = []
+    for char in text:
+        items = parser.feed(char)
+        emitted.extend(items)
+        # 블록은 다음 구분자가 끝까지 들어온 뒤에야 완성됩니다.
+        assert len(items) <= 1
+    assert emitted == STRATEGIES[:2]
+    assert parser.close() == STRATEGIES[2:]
+    assert parser.close() == []
+
+
+def test_stream_parser_separator_split_across_chunks():
+    text = format_strategies(STRATEGIES[:2])
+    cut = text.index("---") + 1
+    parser = StrategyStreamParser()
+    assert parser.feed(text[:cut]) == []
+    assert parser.feed(text[cut:]) == STRATEGIES[:1]
+    assert parser.close() == STRATEGIES[1:2]
+
+
+def turn(question, answer):
+    return (("user", question), ("model", answer))
+
+
+def test_trim_history_keeps_short_history():
+    history = turn("상황", "답") + turn("질문", "답2")
+    assert trim_history(history, budget=0) == history
+
+
+def test_trim_history_keeps_first_and_last_pairs_and_recent_middle():
+    history = (
+        turn("상황", "첫 답")
+        + turn("오래된 질문", "가" * 100)
+        + turn("최근 질문", "나" * 10)
+        + turn("마지막 질문", "마지막 답")
+    )
+    fixed = sum(estimate_tokens(text) for _, text in history[:2] + history[-2:])
+    recent = sum(estimate_tokens(text) for _, text in history[4:6])
+
+    trimmed = trim_history(history, budget=fixed + recent)
+    assert trimmed == history[:2] + history[4:6] + history[-2:]
+    assert trim_history(history, budget=fixed) == history[:2] + history[-2:]
+    assert trim_history(history, budget=10_000) == history
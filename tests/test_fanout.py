@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fanout import fan_out
+
+
+class HeldExecutor:
+    """호출을 붙잡아 두었다가 hold개가 모이면 한꺼번에 끝내는 실행기입니다."""
+
+    def __init__(self, hold):
+        self.hold = hold
+        self.submitted = []
+
+    def submit(self, fn):
+        future = Future()
+        self.submitted.append((future, fn))
+        if len(self.submitted) == self.hold:
+            for held, held_fn in self.submitted:
+                try:
+                    held.set_result(held_fn())
+                except Exception as e:
+                    held.set_exception(e)
+        return future
+
+
+def test_hedge_success_wins_over_failure_in_same_batch():
+    # done 집합의 순회 순서에 기대지 않도록 여러 번 확인합니다.
+    for _ in range(20):
+        attempts = []
+
+        def call():
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise RuntimeError("첫 호출 실패")
+            return "ok"
+
+        results = list(fan_out(HeldExecutor(2), {"a": call}, 5, hedge_after=0.01))
+        assert results == [("a", "ok", None)]
+
+
+def test_reports_errors_and_timeouts():
+    release = threading.Event()
+
+    def fail():
+        raise ValueError("실패")
+
+    def slow():
+        release.wait(5)
+        return "늦음"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = {
+            key: (value, error)
+            for key, value, error in fan_out(
+                executor, {"ok": lambda: 1, "fail": fail, "slow": slow}, 0.2
+            )
+        }
+        release.set()
+    assert results["ok"] == (1, None)
+    assert isinstance(results["fail"][1], ValueError)
+    assert isinstance(results["slow"][1], TimeoutError)
+
+
+def test_hedge_replaces_slow_call():
+    calls = []
+    release = threading.Event()
+
+    def call():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(5)
+            return "느린 원래 호출"
+        return "재전송"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        started = time.monotonic()
+        results = list(fan_out(executor, {"a": call}, 5, hedge_after=0.05))
+        release.set()
+    assert results == [("a", "재전송", None)]
+    assert time.monotonic() - started < 1
+
+
+def test_before_submit_runs_for_each_call_and_hedge():
+    tokens = []
+    calls = []
+    release = threading.Event()
+
+    def call():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(5)
+            return "느린 원래 호출"
+        return "재전송"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            fan_out(
+                executor,
+                {"a": call},
+                5,
+                hedge_after=0.05,
+                before_submit=lambda: tokens.append(None),
+            )
+        )
+        release.set()
+    assert results == [("a", "재전송", None)]
+    assert len(tokens) == 2
+
+
+def test_failed_call_is_reported_when_hedge_cannot_be_sent():
+    tokens = []
+
+    def take_token():
+        if tokens:
+            raise RuntimeError("토큰 없음")
+        tokens.append(None)
+
+    def fail():
+        raise ValueError("실패")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = list(
+            fan_out(executor, {"a": fail}, 5, hedge_after=1, before_submit=take_token)
+        )
+    assert len(results) == 1
+    assert isinstance(results[0][2], ValueError)
@@ -0,0 +1,38 @@
+from hall_of_fame import ALL_SPORTS, HallOfFame
+
+RECORDS = [
+    {"선수": "김연아", "종목": "피겨", "전략": "연습처럼 시합한다"},
+    {"선수": "손흥민", "종목": "축구", "전략": "다음 기회에 집중한다"},
+    {"선수": "박지성", "종목": "축구", "전략": "연습량으로 불안을 이긴다"},
+    {"선수": "Kim", "종목": "골프", "전략": "Routine First"},
+]
+
+
+def test_empty_query_returns_all_or_sport():
+    hall = HallOfFame(RECORDS)
+    assert list(hall.search()) == [0, 1, 2, 3]
+    assert hall.search(sport="축구") == (1, 2)
+    assert hall.sports == [ALL_SPORTS, "골프", "축구", "피겨"]
+
+
+def test_search_matches_substrings_in_name_and_strategy():
+    hall = HallOfFame(RECORDS)
+    assert hall.search("연습") == (0, 2)
+    assert hall.search("연습", sport="축구") == (2,)
+    assert hall.search("손흥민") == (1,)
+    # 2-gram은 모두 있지만 이어져 있지 않으면 찾지 않습니다.
+    assert hall.search("연습시") == ()
+
+
+def test_single_character_and_case_insensitive_search():
+    hall = HallOfFame(RECORDS)
+    assert hall.search("불") == (2,)
+    assert hall.search("  routine ") == (3,)
+    assert hall.search("없는말") == ()
+
+
+def test_page_slices_results():
+    hall = HallOfFame(RECORDS)
+    indices = hall.search()
+    assert [r["선수"] for r in hall.page(indices, 1, 3)] == ["Kim"]
+    assert hall.page(hall.search("연습"), 0, 1) == [RECORDS[0]]
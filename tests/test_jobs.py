@@ -0,0 +1,91 @@
+import threading
+import time
+
+from jobs import JobRunner
+from ratelimit import SingleFlight
+
+
+def wait_until(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    runner = JobRunner(max_workers=4)
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def shared_call(on_strategy):
+        result = []
+        for item in ("a", "b"):
+            started.set()
+            release.wait(5)
+            result.append(item)
+            on_strategy(result)
+        return result
+
+    def work(job):
+        strategies, _ = flights.do("prompt", lambda: shared_call(job.publish), 5)
+        return strategies
+
+    leader, _ = runner.submit("leader", work, 5)
+    assert started.wait(5)
+    follower, _ = runner.submit("follower", work, 5)
+    # 후속 작업이 공유 호출을 기다리기 시작할 시간을 줍니다.
+    time.sleep(0.1)
+
+    runner.cancel("leader")
+    release.set()
+
+    assert wait_until(lambda: not follower.running)
+    assert follower.status == "done"
+    assert follower.result == ["a", "b"]
+    assert leader.status == "cancelled"
+
+
+def test_publish_stops_after_cancel():
+    runner = JobRunner(max_workers=1)
+    job, _ = runner.submit("key", lambda job: time.sleep(0.1), 5)
+    job.publish(["a"])
+    job.cancel()
+    job.publish(["a", "b"])
+    assert job.partial == ["a"]
+    assert job.status == "cancelled"
+
+
+def test_cancelled_follower_releases_its_worker():
+    runner = JobRunner(max_workers=2)
+    flights = SingleFlight(check_interval=0.01)
+    started = threading.Event()
+    release = threading.Event()
+
+    def shared_call():
+        started.set()
+        release.wait(5)
+        return ["a"]
+
+    def work(job):
+        job.check()
+        strategies, _ = flights.do("prompt", shared_call, 5, check=job.check)
+        return strategies
+
+    leader, _ = runner.submit("leader", work, 5)
+    assert started.wait(5)
+    follower, _ = runner.submit("follower", work, 5)
+    time.sleep(0.05)
+    runner.cancel("follower")
+
+    # 취소된 작업이 워커를 놓아야 같은 크기의 풀에서 새 작업이 바로 실행됩니다.
+    ran = threading.Event()
+    runner.submit("next", lambda job: ran.set(), 5)
+    assert ran.wait(1)
+
+    release.set()
+    assert wait_until(lambda: not leader.running)
+    assert leader.status == "done"
+    assert follower.status == "cancelled"
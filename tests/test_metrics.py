@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from metrics import REGISTRY, FileExporter, RerunProfiler
+
+
+def test_rerun_profiler_refuses_nested_start_and_can_restart(tmp_path):
+    outer = RerunProfiler(str(tmp_path), slow_ms=0)
+    outer.start()
+    try:
+        with pytest.raises(ValueError):
+            RerunProfiler(str(tmp_path), slow_ms=0).start()
+    finally:
+        path = outer.stop("menu0")
+    assert path is not None and path.endswith(".prof")
+
+    inner = RerunProfiler(str(tmp_path), slow_ms=60_000)
+    inner.start()
+    assert inner.stop("fragment-ai_job_panel") is None
+
+
+def test_file_exporter_refreshes_without_reruns(tmp_path):
+    counter = REGISTRY.counter("test_file_exporter_total", "Test counter.")
+    path = tmp_path / "metrics.prom"
+    exporter = FileExporter(path, interval_seconds=0.02).start()
+    try:
+        counter.inc()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if path.exists() and "test_file_exporter_total 1" in path.read_text():
+                break
+            time.sleep(0.01)
+        assert "test_file_exporter_total 1" in path.read_text()
+    finally:
+        exporter.stop()
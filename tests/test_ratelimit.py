@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from ratelimit import RateLimitBusy, SingleFlight, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=50, burst=2)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire(timeout=1)
+    # 세 번째 토큰은 1/50초 정도 기다려야 합니다.
+    assert time.monotonic() - started >= 0.01
+
+
+def test_token_bucket_rejects_when_waiters_are_full():
+    bucket = TokenBucket(rate=0.5, burst=1, max_waiters=1)
+    bucket.acquire()
+    errors = []
+
+    def wait_turn():
+        try:
+            bucket.acquire(timeout=0.3)
+        except RateLimitBusy as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait_turn)
+    waiter.start()
+    time.sleep(0.05)
+    with pytest.raises(RateLimitBusy):
+        bucket.acquire(timeout=1)
+    waiter.join()
+    # 대기하던 호출도 토큰을 못 받고 시간 초과로 끝납니다.
+    assert len(errors) == 1
+    assert bucket.stats()["waiters"] == 0
+
+
+def test_single_flight_shares_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def fn():
+        calls.append(None)
+        release.wait(5)
+        return "결과"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do("key", fn, 5)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert all(result == "결과" for result, _ in results)
+    assert flights.in_flight() == 0
+
+
+def test_single_flight_follower_stops_waiting_when_check_fails():
+    flights = SingleFlight(check_interval=0.01)
+    release = threading.Event()
+    started = threading.Event()
+    leader_results = []
+
+    def fn():
+        started.set()
+        release.wait(5)
+        return "결과"
+
+    leader = threading.Thread(
+        target=lambda: leader_results.append(flights.do("key", fn))
+    )
+    leader.start()
+    assert started.wait(5)
+
+    cancelled = threading.Event()
+
+    def check():
+        if cancelled.is_set():
+            raise RuntimeError("취소")
+
+    timer = threading.Timer(0.05, cancelled.set)
+    timer.start()
+    began = time.monotonic()
+    with pytest.raises(RuntimeError):
+        flights.do("key", fn, timeout=5, check=check)
+    assert time.monotonic() - began < 1
+
+    # 기다리기를 그만둔 호출자와 상관없이 공유 호출은 끝까지 진행됩니다.
+    release.set()
+    leader.join()
+    assert leader_results == [("결과", False)]
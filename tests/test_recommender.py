@@ -0,0 +1,60 @@
+from recommender import StrategyIndex, char_ngrams
+
+
+def doc(text):
+    return {"strategy": text}
+
+
+def test_char_ngrams_normalizes_spacing_and_case():
+    assert char_ngrams("  AB  c ") == char_ngrams("ab c")
+    assert "긴장" in char_ngrams("긴장될 때")
+
+
+def test_bm25_ranks_closest_document_first():
+    index = StrategyIndex()
+    index.add("a", "시합 전에 긴장될 때 호흡을 길게 내쉰다", doc("호흡"))
+    index.add("b", "체력이 떨어질 때 페이스를 나눈다", doc("페이스"))
+    index.add("c", "실수한 뒤 다음 공에 집중한다", doc("집중"))
+
+    results = index.search("긴장될 때 호흡", k=3)
+    assert results[0][1] == doc("호흡")
+    assert 0 < results[0][0] <= 1
+    assert [score for score, _ in results] == sorted(
+        (score for score, _ in results), reverse=True
+    )
+    assert index.search("긴장될 때 호흡", min_score=results[0][0] + 0.01) == []
+
+
+def test_owned_documents_are_visible_only_to_their_owner():
+    index = StrategyIndex()
+    index.add("public", "긴장될 때 호흡", doc("공용"))
+    index.add("mine", "긴장될 때 호흡 세기", doc("내 것"), owner="me")
+
+    assert {d["strategy"] for _, d in index.search("긴장 호흡", owner="me")} == {
+        "공용",
+        "내 것",
+    }
+    assert [d for _, d in index.search("긴장 호흡", owner="other")] == [doc("공용")]
+    assert [d for _, d in index.search("긴장 호흡")] == [doc("공용")]
+
+
+def test_remove_then_add_again():
+    index = StrategyIndex()
+    assert index.add("a", "긴장될 때 호흡", doc("처음"))
+    assert not index.add("a", "긴장될 때 호흡", doc("중복"))
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert index.search("긴장 호흡") == []
+    assert len(index) == 0
+
+    assert index.add("a", "긴장될 때 호흡", doc("다시"))
+    assert [d for _, d in index.search("긴장 호흡")] == [doc("다시")]
+    assert len(index) == 1
+
+
+def test_index_grows_past_initial_capacity():
+    index = StrategyIndex()
+    for i in range(200):
+        index.add(i, f"전략 {i} 번째 긴장 완화", doc(str(i)))
+    assert len(index) == 200
+    assert index.search("199 번째", k=1)[0][1] == doc("199")
@@ -0,0 +1,35 @@
+import sqlite3
+
+import response_cache
+from response_cache import ResponseCache
+
+STRATEGIES = [{"strategy": "호흡", "explanation": "길게 내쉰다"}]
+
+
+def test_round_trip_normalizes_prompt(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    cache.set("model", "시합 전  긴장", STRATEGIES, label="긴장")
+    assert cache.get("model", "시합 전 긴장") == STRATEGIES
+    assert cache.get("other", "시합 전 긴장") is None
+    assert list(cache.entries("model")) == [("긴장", STRATEGIES)]
+
+
+def test_locked_database_is_a_miss_or_skipped_write(tmp_path, monkeypatch):
+    # 적중할 때마다 LRU 시각을 갱신하게 해 쓰기 잠금에 걸리도록 합니다.
+    monkeypatch.setattr(response_cache, "TOUCH_INTERVAL_SECONDS", -1)
+    path = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(path)
+    cache.set("model", "긴장", STRATEGIES)
+    cache._connect().execute("PRAGMA busy_timeout = 0")
+
+    other = sqlite3.connect(path)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        cache.set("model", "체력", STRATEGIES)
+        assert cache.get("model", "긴장") == STRATEGIES
+    finally:
+        other.rollback()
+        other.close()
+
+    assert cache.get("model", "체력") is None
+    assert cache.stats()["errors"] == 2
@@ -0,0 +1,15 @@
+from static_assets import FONT_FALLBACK_URL, SOURCE_STYLESHEET, build_stylesheet
+
+
+def test_stylesheet_imports_remote_font_without_local_subset(tmp_path):
+    name = build_stylesheet(SOURCE_STYLESHEET, tmp_path, {})
+    css = (tmp_path / name).read_text(encoding="utf-8")
+    assert css.startswith(f"@import url('{FONT_FALLBACK_URL}');")
+
+
+def test_stylesheet_uses_local_subset_when_built(tmp_path):
+    name = build_stylesheet(SOURCE_STYLESHEET, tmp_path, {400: "font-400.abc.woff2"})
+    css = (tmp_path / name).read_text(encoding="utf-8")
+    assert css.startswith("@font-face{")
+    assert "@import" not in css
+    assert "format('woff2')" in css
@@ -0,0 +1,36 @@
+from strategy_store import StrategyStore
+
+
+def test_page_walks_newest_first_with_cursor(tmp_path):
+    store = StrategyStore(tmp_path / "strategies.sqlite3")
+    ids = [store.add("me", "홍길동", f"전략 {i}") for i in range(5)]
+    store.add("other", "남", "다른 사람 전략")
+
+    first = store.page("me", limit=2)
+    assert [row["id"] for row in first] == [ids[4], ids[3]]
+    second = store.page("me", limit=2, before_id=first[-1]["id"])
+    assert [row["id"] for row in second] == [ids[2], ids[1]]
+    last = store.page("me", limit=2, before_id=second[-1]["id"])
+    assert [row["id"] for row in last] == [ids[0]]
+    assert store.page("me", limit=2, before_id=ids[0]) == []
+    assert len(store.page("me")) == 5
+    assert store.count("me") == 5
+
+
+def test_delete_is_scoped_to_owner(tmp_path):
+    store = StrategyStore(tmp_path / "strategies.sqlite3")
+    strategy_id = store.add("me", "홍길동", "호흡")
+    assert not store.delete("other", strategy_id)
+    assert store.delete("me", strategy_id)
+    assert not store.delete("me", strategy_id)
+    assert store.count("me") == 0
+
+
+def test_iter_all_returns_every_owner_oldest_first(tmp_path):
+    store = StrategyStore(tmp_path / "strategies.sqlite3")
+    store.add("a", "가", "하나")
+    store.add("b", "나", "둘")
+    assert [(row["owner"], row["strategy"]) for row in store.iter_all()] == [
+        ("a", "하나"),
+        ("b", "둘"),
+    ]